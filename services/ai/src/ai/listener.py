@@ -525,11 +525,26 @@ async def listen_tool_approvals(redis_client: aioredis.Redis):
             )
 
 
+def start_dispatched_workloads(
+    workloads: list[dict], clone_path: str, redis_client: aioredis.Redis
+):
+    """Start a session per dispatched workload without waiting on any of them.
+
+    Shared by the dispatch:confirmed listener and POST /workloads/start.
+    """
+    for wd in workloads:
+        asyncio.create_task(
+            start_workload_session(wd, clone_path, redis_client),
+            name=f"workload-start-{wd['chat_id'][:8]}",
+        )
+
+
 async def listen_dispatch_confirmations(redis_client: aioredis.Redis):
     """Subscribe to dispatch:confirmed and start workload sessions.
 
-    The API service publishes to this channel when a user confirms a dispatch
-    card. Each message contains persisted workload data and the clone_path.
+    The API service starts dispatches over POST /workloads/start and only
+    publishes here when it couldn't reach that endpoint. Each message
+    contains persisted workload data and the clone_path.
     """
     pubsub = redis_client.pubsub()
     await pubsub.subscribe("dispatch:confirmed")
@@ -548,8 +563,4 @@ async def listen_dispatch_confirmations(redis_client: aioredis.Redis):
             len(workloads),
         )
 
-        for wd in workloads:
-            asyncio.create_task(
-                start_workload_session(wd, clone_path, redis_client),
-                name=f"workload-start-{wd['chat_id'][:8]}",
-            )
+        start_dispatched_workloads(workloads, clone_path, redis_client)
@@ -18,6 +18,7 @@ from .listener import (
     listen_chat_messages,
     listen_dispatch_confirmations,
     listen_tool_approvals,
+    start_dispatched_workloads,
 )
 from .screencast import shutdown_all_screencasts
 from .session import (
@@ -58,6 +59,11 @@ class ResolveRequest(BaseModel):
     message: str | None = None
 
 
+class StartWorkloadsRequest(BaseModel):
+    clone_path: str
+    workloads: list[dict]
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     client = aioredis.from_url(settings.redis_url)
@@ -257,6 +263,14 @@ async def resolve_workload(chat_id: str, req: ResolveRequest):
     return {"status": "needs_attention", "outcome": req.outcome}
 
 
+@app.post("/workloads/start", status_code=202)
+async def start_workloads(req: StartWorkloadsRequest):
+    """Start sessions for workloads the API just dispatched and persisted."""
+    logger.info("Dispatch received — starting %d workload(s)", len(req.workloads))
+    start_dispatched_workloads(req.workloads, req.clone_path, app.state.redis)
+    return {"status": "starting", "count": len(req.workloads)}
+
+
 @app.post("/chats/{chat_id}/retry")
 async def retry_workload(chat_id: str):
     """Admin session requests a fresh retry of a failed workload session."""
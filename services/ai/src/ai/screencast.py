@@ -1,6 +1,7 @@
 """CDP Screencast — stream live browser frames to Redis for frontend consumption."""
 
 import asyncio
+import base64
 import glob as globmod
 import json
 import logging
@@ -197,11 +198,9 @@ async def start_screencast(
             if not frame_data or session_id is None:
                 continue
 
-            # Publish frame to Redis
-            await redis_client.publish(
-                frames_channel,
-                json.dumps({"type": "frame", "data": frame_data}),
-            )
+            # Publish the raw JPEG: frames travel as binary all the way to
+            # the browser, while control messages on the channel stay JSON
+            await redis_client.publish(frames_channel, base64.b64decode(frame_data))
 
             # Acknowledge frame so CDP sends the next one
             await ws.send(
@@ -0,0 +1,64 @@
+"""store room, chat and member types as enums
+
+Revision ID: a8b9c0d1e2f3
+Revises: f7a8b9c0d1e2
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "a8b9c0d1e2f3"
+down_revision: Union[str, None] = "f7a8b9c0d1e2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+room_type = postgresql.ENUM("standard", "admin", name="room_type")
+chat_type = postgresql.ENUM("primary", "workload", "admin", name="chat_type")
+member_type = postgresql.ENUM(
+    "human", "ai", "coordinator", name="project_member_type"
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for enum in (room_type, chat_type, member_type):
+        enum.create(bind, checkfirst=True)
+
+    op.alter_column("rooms", "type", server_default=None)
+    op.alter_column(
+        "rooms", "type", type_=room_type, postgresql_using="type::room_type"
+    )
+    op.alter_column("rooms", "type", server_default="standard")
+    op.alter_column(
+        "chats", "type", type_=chat_type, postgresql_using="type::chat_type"
+    )
+    op.alter_column(
+        "project_members",
+        "type",
+        type_=member_type,
+        postgresql_using="type::project_member_type",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "project_members",
+        "type",
+        type_=postgresql.VARCHAR(),
+        postgresql_using="type::text",
+    )
+    op.alter_column(
+        "chats", "type", type_=postgresql.VARCHAR(), postgresql_using="type::text"
+    )
+    op.alter_column("rooms", "type", server_default=None)
+    op.alter_column(
+        "rooms", "type", type_=postgresql.VARCHAR(), postgresql_using="type::text"
+    )
+    op.alter_column("rooms", "type", server_default="standard")
+
+    bind = op.get_bind()
+    for enum in (member_type, chat_type, room_type):
+        enum.drop(bind, checkfirst=True)
@@ -0,0 +1,139 @@
+"""partition llm_usage by month
+
+Revision ID: b9c0d1e2f3a4
+Revises: a8b9c0d1e2f3
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "b9c0d1e2f3a4"
+down_revision: Union[str, None] = "a8b9c0d1e2f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = (
+    "id, created_at, model, provider, input_tokens, output_tokens, cost, "
+    "request_type, caller, session_id, num_turns, duration_ms, member_id, project_id"
+)
+
+# Creates any missing monthly partitions (llm_usage_YYYY_MM, UTC month bounds)
+# covering from_month..to_month. The API calls this daily to stay ahead.
+ENSURE_PARTITIONS = """
+CREATE OR REPLACE FUNCTION llm_usage_ensure_partitions(from_month date, to_month date)
+RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    m date := date_trunc('month', from_month)::date;
+BEGIN
+    WHILE m <= to_month LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF llm_usage '
+            'FOR VALUES FROM (%L) TO (%L)',
+            'llm_usage_' || to_char(m, 'YYYY_MM'),
+            m::timestamp AT TIME ZONE 'UTC',
+            (m + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+        );
+        m := (m + interval '1 month')::date;
+    END LOOP;
+END
+$$
+"""
+
+
+def _llm_usage_columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("model", sa.String(), nullable=False),
+        sa.Column("provider", sa.String(), nullable=False),
+        sa.Column("input_tokens", sa.Integer(), nullable=True),
+        sa.Column("output_tokens", sa.Integer(), nullable=True),
+        sa.Column("cost", sa.Float(), nullable=False),
+        sa.Column("request_type", sa.String(), nullable=False),
+        sa.Column("caller", sa.String(), nullable=False),
+        sa.Column("session_id", sa.String(), nullable=True),
+        sa.Column("num_turns", sa.Integer(), nullable=True),
+        sa.Column("duration_ms", sa.Integer(), nullable=True),
+        sa.Column(
+            "member_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("project_members.id"),
+            nullable=True,
+        ),
+        sa.Column(
+            "project_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("projects.id"),
+            nullable=True,
+        ),
+    ]
+
+
+def _create_indexes() -> None:
+    op.create_index(
+        "ix_llm_usage_caller_created_at", "llm_usage", ["caller", "created_at"]
+    )
+    op.create_index(
+        "ix_llm_usage_member_created_at", "llm_usage", ["member_id", "created_at"]
+    )
+
+
+def upgrade() -> None:
+    op.drop_index("ix_llm_usage_member_created_at", table_name="llm_usage")
+    op.drop_index("ix_llm_usage_caller_created_at", table_name="llm_usage")
+    op.rename_table("llm_usage", "llm_usage_unpartitioned")
+    op.execute(
+        "ALTER TABLE llm_usage_unpartitioned "
+        "RENAME CONSTRAINT llm_usage_pkey TO llm_usage_unpartitioned_pkey"
+    )
+
+    # The partition key has to be part of the primary key.
+    op.create_table(
+        "llm_usage",
+        *_llm_usage_columns(),
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.execute("CREATE TABLE llm_usage_default PARTITION OF llm_usage DEFAULT")
+    op.execute(ENSURE_PARTITIONS)
+    # Months are computed in UTC, matching the partition bounds, not in the
+    # session TimeZone.
+    op.execute(
+        "SELECT llm_usage_ensure_partitions("
+        "coalesce((SELECT (min(created_at) AT TIME ZONE 'UTC')::date "
+        "FROM llm_usage_unpartitioned), (now() AT TIME ZONE 'UTC')::date), "
+        "((now() AT TIME ZONE 'UTC')::date + interval '2 months')::date)"
+    )
+    op.execute(
+        f"INSERT INTO llm_usage ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM llm_usage_unpartitioned"
+    )
+    op.drop_table("llm_usage_unpartitioned")
+    _create_indexes()
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_usage_member_created_at", table_name="llm_usage")
+    op.drop_index("ix_llm_usage_caller_created_at", table_name="llm_usage")
+    op.rename_table("llm_usage", "llm_usage_partitioned")
+    op.execute(
+        "ALTER TABLE llm_usage_partitioned "
+        "RENAME CONSTRAINT llm_usage_pkey TO llm_usage_partitioned_pkey"
+    )
+    op.create_table(
+        "llm_usage",
+        *_llm_usage_columns(),
+        sa.PrimaryKeyConstraint("id", name="llm_usage_pkey"),
+    )
+    op.execute(
+        f"INSERT INTO llm_usage ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM llm_usage_partitioned"
+    )
+    # Dropping the parent drops every partition with it.
+    op.drop_table("llm_usage_partitioned")
+    op.execute("DROP FUNCTION llm_usage_ensure_partitions(date, date)")
+    _create_indexes()
@@ -0,0 +1,39 @@
+"""index users by display_name
+
+Revision ID: c0d1e2f3a4b5
+Revises: b9c0d1e2f3a4
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "c0d1e2f3a4b5"
+down_revision: Union[str, None] = "b9c0d1e2f3a4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The user picker lists (id, display_name) ordered by display_name;
+    # INCLUDE id so it is an index-only scan with no sort.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_display_name",
+            "users",
+            ["display_name"],
+            postgresql_include=["id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_display_name",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
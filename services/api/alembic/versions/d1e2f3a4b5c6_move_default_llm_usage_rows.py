@@ -0,0 +1,118 @@
+"""move default-partition rows when creating llm_usage months
+
+Revision ID: d1e2f3a4b5c6
+Revises: c0d1e2f3a4b5
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "d1e2f3a4b5c6"
+down_revision: Union[str, None] = "c0d1e2f3a4b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = (
+    "id, created_at, model, provider, input_tokens, output_tokens, cost, "
+    "request_type, caller, session_id, num_turns, duration_ms, member_id, project_id"
+)
+
+# Rows that arrived before their month's partition existed sit in
+# llm_usage_default, and a plain CREATE ... PARTITION OF for that month would
+# fail on them. Such a month is created with the default partition detached,
+# its rows moved across, then the default re-attached. Each month runs in its
+# own subtransaction: a month that can't get its locks within lock_timeout is
+# skipped and returned, so the caller can log it and the rest still get made.
+# Any other error is raised.
+ENSURE_PARTITIONS = f"""
+CREATE FUNCTION llm_usage_ensure_partitions(from_month date, to_month date)
+RETURNS text[] LANGUAGE plpgsql AS $$
+DECLARE
+    m date := date_trunc('month', from_month)::date;
+    part text;
+    lo timestamptz;
+    hi timestamptz;
+    skipped text[] := '{{}}';
+BEGIN
+    PERFORM set_config('lock_timeout', '5s', true);
+    WHILE m <= to_month LOOP
+        part := 'llm_usage_' || to_char(m, 'YYYY_MM');
+        lo := m::timestamp AT TIME ZONE 'UTC';
+        hi := (m + interval '1 month')::timestamp AT TIME ZONE 'UTC';
+        BEGIN
+            IF to_regclass(quote_ident(part)) IS NULL THEN
+                IF EXISTS (
+                    SELECT 1 FROM llm_usage_default
+                    WHERE created_at >= lo AND created_at < hi
+                ) THEN
+                    ALTER TABLE llm_usage DETACH PARTITION llm_usage_default;
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF llm_usage '
+                        'FOR VALUES FROM (%L) TO (%L)',
+                        part, lo, hi
+                    );
+                    INSERT INTO llm_usage ({COLUMNS})
+                    SELECT {COLUMNS} FROM llm_usage_default
+                    WHERE created_at >= lo AND created_at < hi;
+                    DELETE FROM llm_usage_default
+                    WHERE created_at >= lo AND created_at < hi;
+                    ALTER TABLE llm_usage ATTACH PARTITION llm_usage_default DEFAULT;
+                ELSE
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF llm_usage '
+                        'FOR VALUES FROM (%L) TO (%L)',
+                        part, lo, hi
+                    );
+                END IF;
+            END IF;
+        EXCEPTION WHEN lock_not_available THEN
+            skipped := skipped || part;
+        END;
+        m := (m + interval '1 month')::date;
+    END LOOP;
+    RETURN skipped;
+END
+$$
+"""
+
+# The definition from b9c0d1e2f3a4, restored on downgrade.
+PREVIOUS_ENSURE_PARTITIONS = """
+CREATE OR REPLACE FUNCTION llm_usage_ensure_partitions(from_month date, to_month date)
+RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    m date := date_trunc('month', from_month)::date;
+BEGIN
+    WHILE m <= to_month LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF llm_usage '
+            'FOR VALUES FROM (%L) TO (%L)',
+            'llm_usage_' || to_char(m, 'YYYY_MM'),
+            m::timestamp AT TIME ZONE 'UTC',
+            (m + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+        );
+        m := (m + interval '1 month')::date;
+    END LOOP;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    # The return type changes, which CREATE OR REPLACE can't do
+    op.execute("DROP FUNCTION llm_usage_ensure_partitions(date, date)")
+    op.execute(ENSURE_PARTITIONS)
+    # Rescue anything already stranded in the default partition. Months are
+    # taken in UTC to match the partition bounds, whatever the session TimeZone.
+    op.execute(
+        "SELECT llm_usage_ensure_partitions("
+        "(min(created_at) AT TIME ZONE 'UTC')::date, "
+        "(max(created_at) AT TIME ZONE 'UTC')::date) "
+        "FROM llm_usage_default HAVING count(*) > 0"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION llm_usage_ensure_partitions(date, date)")
+    op.execute(PREVIOUS_ENSURE_PARTITIONS)
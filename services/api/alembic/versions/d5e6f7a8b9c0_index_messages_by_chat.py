@@ -0,0 +1,51 @@
+"""index messages by chat
+
+Revision ID: d5e6f7a8b9c0
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "d5e6f7a8b9c0"
+down_revision: Union[str, None] = "c3d4e5f6a7b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Every message query filters on chat_id and orders by created_at; build
+    # the replacement without locking writes on the busiest table.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_messages_chat_id_created_at",
+            "messages",
+            ["chat_id", "created_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_messages_created_at",
+            table_name="messages",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_messages_created_at",
+            "messages",
+            ["created_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_messages_chat_id_created_at",
+            table_name="messages",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,47 @@
+"""index foreign keys
+
+Revision ID: e6f7a8b9c0d1
+Revises: d5e6f7a8b9c0
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "e6f7a8b9c0d1"
+down_revision: Union[str, None] = "d5e6f7a8b9c0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# project_members.project_id is already the leading column of
+# uq_project_members_project_display_name; sessions.user_id has its own index.
+INDEXES = [
+    ("ix_chats_room_id", "chats", "room_id"),
+    ("ix_rooms_project_id", "rooms", "project_id"),
+    ("ix_workloads_main_chat_id", "workloads", "main_chat_id"),
+    ("ix_workloads_member_id", "workloads", "member_id"),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,37 @@
+"""index project members by created_at
+
+Revision ID: f7a8b9c0d1e2
+Revises: e6f7a8b9c0d1
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "f7a8b9c0d1e2"
+down_revision: Union[str, None] = "e6f7a8b9c0d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Member listings filter on project_id and order by created_at.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_project_members_project_id_created_at",
+            "project_members",
+            ["project_id", "created_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_project_members_project_id_created_at",
+            table_name="project_members",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
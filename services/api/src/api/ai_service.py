@@ -0,0 +1,89 @@
+"""HTTP calls to the AI service, guarded by a circuit breaker."""
+
+import logging
+import time
+
+import httpx
+from fastapi import HTTPException
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT_SECONDS = 30.0
+
+# One pooled client for the process lifetime so proxied calls reuse
+# keep-alive connections; closed from the app lifespan.
+ai_client = httpx.AsyncClient(
+    base_url=settings.ai_service_url,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+)
+
+
+class CircuitBreaker:
+    """Fail fast once a dependency has failed repeatedly.
+
+    Closed: every call goes through. After ``failure_threshold``
+    consecutive failures the breaker opens and rejects calls until
+    ``reset_timeout`` has passed; then a single probe is let through
+    (half-open) and each further probe waits another ``reset_timeout``.
+    A successful call closes the breaker again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - self._opened_at < self.reset_timeout:
+            return False
+        # Re-arm before probing so concurrent callers keep failing fast,
+        # and a probe that never reports back can't wedge the breaker.
+        self._opened_at = now
+        return True
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info("AI service circuit closed")
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            if self._opened_at is None:
+                logger.warning(
+                    "AI service circuit opened after %d consecutive failures",
+                    self._failures,
+                )
+            self._opened_at = time.monotonic()
+
+
+_breaker = CircuitBreaker(FAILURE_THRESHOLD, RESET_TIMEOUT_SECONDS)
+
+
+async def ai_service_request(
+    method: str, path: str, *, timeout: float, **kwargs
+) -> httpx.Response:
+    """Send a request to the AI service and return its response.
+
+    Raises HTTPException(503) without calling out while the circuit is
+    open. Transport errors (timeouts, refused connections) count against
+    the breaker and are re-raised; any HTTP response, whatever its
+    status, counts as the service being reachable.
+    """
+    if not _breaker.allow():
+        raise HTTPException(status_code=503, detail="AI service unavailable")
+    try:
+        resp = await ai_client.request(method, path, timeout=timeout, **kwargs)
+    except httpx.TransportError:
+        _breaker.record_failure()
+        raise
+    _breaker.record_success()
+    return resp
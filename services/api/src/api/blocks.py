@@ -49,10 +49,12 @@ def _get_skill_names(clone_path: Path) -> set[str]:
 async def _get_clone_path(project_id: uuid.UUID) -> Path | None:
     """Get the clone path for a project."""
     async with async_session() as session:
-        project = await session.get(Project, project_id)
-        if project and project.clone_path:
-            return Path(project.clone_path)
-    return None
+        clone_path = (
+            await session.execute(
+                select(Project.clone_path).where(Project.id == project_id)
+            )
+        ).scalar_one_or_none()
+    return Path(clone_path) if clone_path else None
 
 
 def _split_text_block(
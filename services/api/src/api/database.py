@@ -1,6 +1,52 @@
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from collections.abc import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from .config import settings
 
-engine = create_async_engine(settings.database_url)
+# Keep more prepared statements per connection (asyncpg and SQLAlchemy's
+# adapter default to 100) and skip JIT, which only costs latency on the
+# short OLTP queries this service runs.
+_CONNECT_ARGS = {
+    "statement_cache_size": 1024,
+    "prepared_statement_cache_size": 1024,
+    "server_settings": {"jit": "off"},
+}
+
+# Room for every distinct ORM/Core statement the routes issue (default 500),
+# so repeat queries skip SQL compilation instead of churning the LRU.
+QUERY_CACHE_SIZE = 1200
+
+# Recycle connections before idle timeouts in PG or the network can kill
+# them; cheaper than pool_pre_ping's extra round-trip on every checkout.
+POOL_RECYCLE_SECONDS = 1800
+
+engine = create_async_engine(
+    settings.database_url,
+    connect_args=_CONNECT_ARGS,
+    query_cache_size=QUERY_CACHE_SIZE,
+    pool_size=20,
+    max_overflow=10,
+    pool_recycle=POOL_RECYCLE_SECONDS,
+)
 async_session = async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency: one session per request, closed when it finishes."""
+    async with async_session() as session:
+        yield session
+
+
+# Small dedicated pool for pub/sub ingestion writes so a burst of
+# background messages can't hold every slot request handlers need.
+background_engine = create_async_engine(
+    settings.database_url,
+    connect_args=_CONNECT_ARGS,
+    query_cache_size=QUERY_CACHE_SIZE,
+    pool_size=4,
+    max_overflow=4,
+    pool_recycle=POOL_RECYCLE_SECONDS,
+    pool_pre_ping=True,
+)
+background_session = async_sessionmaker(background_engine, expire_on_commit=False)
@@ -0,0 +1,24 @@
+"""Git subprocess execution shared by the routes and manifest checks."""
+
+import asyncio
+
+from .config import settings
+
+# Bulkhead: caps concurrently running git processes across the whole API so
+# a burst of requests can't fork dozens of gits and starve the event loop.
+git_slots = asyncio.Semaphore(settings.max_git_concurrency)
+
+
+async def run_git(*args: str, cwd: str) -> tuple[int, str, str]:
+    """Run a git command and return (returncode, stdout, stderr)."""
+    async with git_slots:
+        proc = await asyncio.create_subprocess_exec(
+            "git",
+            *args,
+            cwd=cwd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await proc.communicate()
+    assert proc.returncode is not None
+    return proc.returncode, stdout.decode().strip(), stderr.decode().strip()
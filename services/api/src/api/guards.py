@@ -1,10 +1,13 @@
 """Reusable endpoint guards as FastAPI dependencies."""
 
+import logging
 import uuid
 from datetime import datetime, timezone
 
+import orjson
 from fastapi import Depends, HTTPException, Request
-from sqlalchemy import select
+from redis.exceptions import RedisError
+from sqlalchemy import func, select
 
 from .database import async_session
 from .models.project import Project
@@ -12,6 +15,130 @@ from .models.project_member import ProjectMember
 from .models.session import Session
 from .models.user import User
 
+logger = logging.getLogger(__name__)
+
+
+def _get_redis():
+    from .main import redis_client
+
+    return redis_client
+
+
+def _session_cache_key(session_id: str) -> str:
+    return f"sess:{session_id}"
+
+
+async def cache_session(session_id: str, user: User, expires_at: datetime) -> None:
+    """Cache the session's user in Redis until the session expires.
+
+    Best-effort: a Redis failure only means the next request takes the DB path.
+    """
+    ttl = int((expires_at - datetime.now(timezone.utc)).total_seconds())
+    if ttl <= 0:
+        return
+    try:
+        await _get_redis().setex(
+            _session_cache_key(session_id), ttl, _encode_user(user)
+        )
+    except RedisError:
+        logger.warning("Failed to cache session in Redis", exc_info=True)
+
+
+async def recache_user_sessions(user: User) -> None:
+    """Rewrite every live session of ``user`` in the cache after a profile change.
+
+    Cached sessions carry a snapshot of the profile, so without this the
+    user's other sessions would serve stale fields until they expire.
+    Best-effort, like cache_session.
+    """
+    async with async_session() as db:
+        rows = (
+            await db.execute(
+                select(Session.id, Session.expires_at).where(
+                    Session.user_id == user.id, Session.expires_at > func.now()
+                )
+            )
+        ).all()
+    if not rows:
+        return
+    payload = _encode_user(user)
+    now = datetime.now(timezone.utc)
+    try:
+        async with _get_redis().pipeline(transaction=False) as pipe:
+            for session_id, expires_at in rows:
+                ttl = int((expires_at - now).total_seconds())
+                if ttl > 0:
+                    pipe.setex(_session_cache_key(session_id), ttl, payload)
+            await pipe.execute()
+    except RedisError:
+        logger.warning("Failed to refresh cached sessions in Redis", exc_info=True)
+
+
+def _encode_user(user: User) -> bytes:
+    return orjson.dumps(
+        {
+            "id": str(user.id),
+            "display_name": user.display_name,
+            "email": user.email,
+            "avatar_url": user.avatar_url,
+        }
+    )
+
+
+async def evict_session(session_id: str) -> None:
+    """Drop a cached session (logout / expiry)."""
+    try:
+        await _get_redis().delete(_session_cache_key(session_id))
+    except RedisError:
+        logger.warning("Failed to evict cached session from Redis", exc_info=True)
+
+
+async def _get_cached_user(session_id: str) -> User | None:
+    try:
+        raw = await _get_redis().get(_session_cache_key(session_id))
+    except RedisError:
+        logger.warning("Failed to read cached session from Redis", exc_info=True)
+        return None
+    if raw is None:
+        return None
+    data = orjson.loads(raw)
+    return User(
+        id=uuid.UUID(data["id"]),
+        display_name=data["display_name"],
+        email=data["email"],
+        avatar_url=data["avatar_url"],
+    )
+
+
+async def get_session_user(session_id: str) -> User | None:
+    """Return the User owning a live session, or None if there isn't one.
+
+    Hot sessions are served from the Redis session cache (keyed
+    ``sess:{session_id}``, expiring with the session) without touching
+    the database; a cache miss falls back to the DB and repopulates it.
+    The returned User is then a detached, transient instance.
+    """
+    cached = await _get_cached_user(session_id)
+    if cached is not None:
+        return cached
+
+    # One indexed lookup covers missing, expired, and orphaned sessions;
+    # expired rows are purged by a background task, not on the request path.
+    async with async_session() as db:
+        row = (
+            await db.execute(
+                select(User, Session.expires_at)
+                .join(Session, Session.user_id == User.id)
+                .where(Session.id == session_id, Session.expires_at > func.now())
+            )
+        ).one_or_none()
+    if row is None:
+        return None
+
+    user, expires_at = row
+    await cache_session(session_id, user, expires_at)
+    return user
+
 
 async def get_current_user(request: Request) -> User:
     """Validate the session cookie and return the authenticated User.
@@ -34,19 +161,10 @@ async def get_current_user(request: Request) -> User:
     if not session_id:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    async with async_session() as db:
-        session = await db.get(Session, session_id)
-        if not session:
-            raise HTTPException(status_code=401, detail="Invalid session")
-        if session.expires_at < datetime.now(timezone.utc):
-            await db.delete(session)
-            await db.commit()
-            raise HTTPException(status_code=401, detail="Session expired")
-
-        user = await db.get(User, session.user_id)
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-        return user
+    user = await get_session_user(session_id)
+    if user is None:
+        raise HTTPException(status_code=401, detail="Invalid or expired session")
+    return user
 
 
 async def get_unlocked_project(project_id: uuid.UUID) -> Project:
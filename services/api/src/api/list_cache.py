@@ -0,0 +1,35 @@
+"""Short-lived in-process caches for hot, rarely-changing list endpoints."""
+
+import time
+from typing import Any
+
+LIST_CACHE_TTL_SECONDS = 5.0
+
+
+class TTLValue:
+    """A single cached value that expires ``ttl`` seconds after it is set."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._value: Any = None
+        self._expires_at = 0.0
+
+    def get(self) -> Any | None:
+        if time.monotonic() < self._expires_at:
+            return self._value
+        return None
+
+    def set(self, value: Any) -> None:
+        self._value = value
+        self._expires_at = time.monotonic() + self.ttl
+
+    def clear(self) -> None:
+        self._value = None
+        self._expires_at = 0.0
+
+
+# Per process (the API runs one uvicorn worker). Routes that change what these
+# lists show clear them; writes made elsewhere, e.g. the AI service adding a
+# member, show up once the TTL lapses.
+projects_cache = TTLValue(LIST_CACHE_TTL_SECONDS)
+users_cache = TTLValue(LIST_CACHE_TTL_SECONDS)
@@ -3,19 +3,26 @@ import json
 import logging
 import uuid
 from contextlib import asynccontextmanager
+from pathlib import Path
 
 import redis.asyncio as aioredis
+from alembic import command
+from alembic.config import Config
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import text
+from sqlalchemy import delete, func, insert, text
 
+from .ai_service import ai_client
 from .blocks import convert_text_blocks
 from .config import settings, setup_logging
-from .database import async_session, engine
+from .database import background_engine, background_session, engine
 from .models.chat import Chat
 from .models.llm_usage import LLMUsage
 from .models.message import Message
 from .models.room import Room
+from .models.session import Session
+from .query_count import QueryCountMiddleware, track_engine
+from .responses import ORJSONResponse
 from .routes.files import router as files_router
 from .routes.members import router as members_router
 from .routes.projects import router as projects_router
@@ -33,50 +40,48 @@ from .websocket.screencast_handler import router as screencast_ws_router
 from .websocket.terminal_handler import router as terminal_ws_router
 from .websocket.manager import manager
 
-setup_logging()
+log_listener = setup_logging()
 logger = logging.getLogger(__name__)
 
-redis_client = aioredis.from_url(settings.redis_url)
+# One pool for every Redis consumer in the API process; pub/sub takes a
+# dedicated connection from it for the lifetime of the subscription. Up to
+# 1 + 2 * PUBSUB_SHARDS connections are held by subscriptions (the event
+# listener plus both relay hubs); the rest serve request traffic. A full
+# pool makes callers wait for a free connection rather than fail.
+REDIS_MAX_CONNECTIONS = 64
+REDIS_POOL_TIMEOUT_SECONDS = 5
+redis_pool = aioredis.BlockingConnectionPool.from_url(
+    settings.redis_url,
+    max_connections=REDIS_MAX_CONNECTIONS,
+    timeout=REDIS_POOL_TIMEOUT_SECONDS,
+)
+redis_client = aioredis.Redis(connection_pool=redis_pool)
 
+SESSION_PURGE_INTERVAL_SECONDS = 15 * 60
+PARTITION_MAINTENANCE_INTERVAL_SECONDS = 24 * 60 * 60
+API_ROOT = Path(__file__).resolve().parents[2]
 
-async def _listen_for_chat_status():
-    """Subscribe to chat:status and broadcast to room WebSocket clients."""
-    sub_client = aioredis.from_url(settings.redis_url)
-    pubsub = sub_client.pubsub()
-    await pubsub.subscribe("chat:status")
-    logger.info("Subscribed to chat:status")
 
-    try:
-        async for raw in pubsub.listen():
-            if raw["type"] != "message":
-                continue
-            try:
-                event = json.loads(raw["data"])
-                room_id = event.get("room_id")
-                if not room_id:
-                    continue
-
-                # Add _event marker so frontend can distinguish from chat messages
-                chat_type = event.get("chat_type")
-                if chat_type == "workload":
-                    event["_event"] = "workload_status"
-                elif chat_type == "admin":
-                    event["_event"] = "admin_status"
-                else:
-                    event["_event"] = "workload_status"
-                await manager.broadcast_room(uuid.UUID(room_id), event)
-            except Exception:
-                logger.exception("Failed to process chat:status message")
-    except asyncio.CancelledError:
-        pass
-    finally:
-        await pubsub.unsubscribe("chat:status")
-        await sub_client.aclose()
+async def _handle_chat_status(event: dict) -> None:
+    """Broadcast a chat:status event to room WebSocket clients."""
+    room_id = event.get("room_id")
+    if not room_id:
+        return
+
+    # Add _event marker so frontend can distinguish from chat messages
+    chat_type = event.get("chat_type")
+    if chat_type == "workload":
+        event["_event"] = "workload_status"
+    elif chat_type == "admin":
+        event["_event"] = "admin_status"
+    else:
+        event["_event"] = "workload_status"
+    await manager.broadcast_room(uuid.UUID(room_id), event)
 
 
 async def _resolve_project_id(chat_id: str) -> uuid.UUID | None:
     """Resolve project_id from chat_id via chat → room → project."""
-    async with async_session() as session:
+    async with background_session() as session:
         chat = await session.get(Chat, uuid.UUID(chat_id))
         if not chat:
             return None
@@ -84,155 +89,242 @@ async def _resolve_project_id(chat_id: str) -> uuid.UUID | None:
         return room.project_id if room else None
 
 
-async def _listen_for_ai_responses():
-    """Subscribe to chat:responses and broadcast AI messages to WebSocket clients."""
-    sub_client = aioredis.from_url(settings.redis_url)
-    pubsub = sub_client.pubsub()
-    await pubsub.subscribe("chat:responses")
-    logger.info("Subscribed to chat:responses")
+async def _handle_ai_response(msg_data: dict) -> None:
+    """Persist an AI message from chat:responses and broadcast it to WebSocket clients."""
+    # Ephemeral events (e.g. agent_activity) — broadcast without persisting
+    if msg_data.get("_event"):
+        chat_id = msg_data.get("chat_id")
+        if chat_id:
+            manager.enqueue(uuid.UUID(chat_id), msg_data)
+        return
 
+    # Auto-convert @mentions, /skills, and [links] in text blocks
     try:
-        async for raw in pubsub.listen():
-            if raw["type"] != "message":
-                continue
-            try:
-                msg_data = json.loads(raw["data"])
-
-                # Ephemeral events (e.g. agent_activity) — broadcast without persisting
-                if msg_data.get("_event"):
-                    chat_id = msg_data.get("chat_id")
-                    if chat_id:
-                        await manager.broadcast(uuid.UUID(chat_id), msg_data)
-                    continue
-
-                # Auto-convert @mentions, /skills, and [links] in text blocks
-                try:
-                    content_data = json.loads(msg_data["content"])
-                    if isinstance(content_data, dict) and "blocks" in content_data:
-                        pid = await _resolve_project_id(msg_data["chat_id"])
-                        if pid:
-                            (
-                                content_data["blocks"],
-                                content_data["mentions"],
-                            ) = await convert_text_blocks(
-                                content_data["blocks"],
-                                pid,
-                                content_data.get("mentions", []),
-                            )
-                            msg_data["content"] = json.dumps(content_data)
-                except (json.JSONDecodeError, KeyError, TypeError):
-                    pass  # Non-JSON or legacy content — skip conversion
-
-                # Persist to PostgreSQL
-                message = Message(
-                    id=uuid.UUID(msg_data["id"]),
-                    chat_id=uuid.UUID(msg_data["chat_id"]),
-                    member_id=uuid.UUID(msg_data["member_id"]),
-                    content=msg_data["content"],
+        content_data = json.loads(msg_data["content"])
+        if isinstance(content_data, dict) and "blocks" in content_data:
+            pid = await _resolve_project_id(msg_data["chat_id"])
+            if pid:
+                (
+                    content_data["blocks"],
+                    content_data["mentions"],
+                ) = await convert_text_blocks(
+                    content_data["blocks"],
+                    pid,
+                    content_data.get("mentions", []),
                 )
-                async with async_session() as session:
-                    session.add(message)
-                    await session.commit()
-                    await session.refresh(message)
+                msg_data["content"] = json.dumps(content_data)
+    except (json.JSONDecodeError, KeyError, TypeError):
+        pass  # Non-JSON or legacy content — skip conversion
+
+    # Persist to PostgreSQL
+    message = Message(
+        id=uuid.UUID(msg_data["id"]),
+        chat_id=uuid.UUID(msg_data["chat_id"]),
+        member_id=uuid.UUID(msg_data["member_id"]),
+        content=msg_data["content"],
+    )
+    async with background_session() as session:
+        session.add(message)
+        await session.commit()
 
-                # Broadcast to connected WebSocket clients
-                await manager.broadcast(uuid.UUID(msg_data["chat_id"]), msg_data)
-            except Exception:
-                logger.exception("Failed to process chat:responses message")
-    except asyncio.CancelledError:
-        pass
-    finally:
-        await pubsub.unsubscribe("chat:responses")
-        await sub_client.aclose()
+    # Broadcast to connected WebSocket clients
+    manager.enqueue(uuid.UUID(msg_data["chat_id"]), msg_data)
+
+
+def _upgrade_head() -> None:
+    """Apply Alembic migrations up to head (blocking)."""
+    # No ini file: alembic.ini's logging section would reconfigure the app's
+    # loggers now that migrations run in-process.
+    cfg = Config()
+    cfg.set_main_option("script_location", str(API_ROOT / "alembic"))
+    command.upgrade(cfg, "head")
 
 
 async def _run_migrations() -> None:
     """Run Alembic migrations on startup."""
     logger.info("Running database migrations...")
-    proc = await asyncio.create_subprocess_exec(
-        "uv",
-        "run",
-        "alembic",
-        "upgrade",
-        "head",
-        cwd="/app",
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await proc.communicate()
-    if proc.returncode != 0:
-        logger.error("Migration failed: %s", stderr.decode())
-        raise RuntimeError(f"Database migration failed: {stderr.decode()}")
-    logger.info("Migrations applied: %s", stdout.decode().strip())
+    try:
+        await asyncio.to_thread(_upgrade_head)
+    except Exception as e:
+        logger.exception("Migration failed")
+        raise RuntimeError(f"Database migration failed: {e}") from e
+    logger.info("Migrations applied")
+
+
+def _cost_row(data: dict) -> dict:
+    """Map a cost:usage payload onto llm_usage column values."""
+    member_id = data.get("member_id")
+    project_id = data.get("project_id")
+    return {
+        "model": data["model"],
+        "provider": data["provider"],
+        "input_tokens": data.get("input_tokens"),
+        "output_tokens": data.get("output_tokens"),
+        "cost": data["cost"],
+        "request_type": data["request_type"],
+        "caller": data["caller"],
+        "session_id": data.get("session_id"),
+        "num_turns": data.get("num_turns"),
+        "duration_ms": data.get("duration_ms"),
+        "member_id": uuid.UUID(member_id) if member_id else None,
+        "project_id": uuid.UUID(project_id) if project_id else None,
+    }
 
 
-async def _listen_for_cost_tracking():
-    """Subscribe to cost:usage and persist LLM cost records."""
-    sub_client = aioredis.from_url(settings.redis_url)
-    pubsub = sub_client.pubsub()
-    await pubsub.subscribe("cost:usage")
-    logger.info("Subscribed to cost:usage")
+async def _handle_cost_usage(data: dict) -> None:
+    """Persist an LLM cost record from cost:usage."""
+    # Core INSERT — llm_usage is append-only, so skip the ORM
+    # unit-of-work and let asyncpg run a plain parameterised insert
+    async with background_session() as session:
+        await session.execute(insert(LLMUsage), [_cost_row(data)])
+        await session.commit()
+
+
+# Channel → handler for the shared pub/sub listener. chat:status is cheap
+# (a room broadcast) and runs inline; the others touch the database, so each
+# gets its own queue and consumer task to keep one slow AI response from
+# holding up status events or cost records. Order is kept per channel.
+_INLINE_HANDLERS = {
+    "chat:status": _handle_chat_status,
+}
+_QUEUED_HANDLERS = {
+    "chat:responses": _handle_ai_response,
+    "cost:usage": _handle_cost_usage,
+}
+
+
+async def _consume_channel(channel: str, handler, queue: asyncio.Queue) -> None:
+    """Run ``handler`` over one channel's queued messages, in arrival order."""
+    while True:
+        data = await queue.get()
+        try:
+            await handler(data)
+        except Exception:
+            logger.exception("Failed to process %s message", channel)
+
+
+async def _listen_for_redis_events():
+    """Subscribe to every API-side channel on one connection and dispatch by name."""
+    pubsub = redis_client.pubsub()
+    channels = [*_INLINE_HANDLERS, *_QUEUED_HANDLERS]
+    await pubsub.subscribe(*channels)
+    logger.info("Subscribed to %s", ", ".join(channels))
+
+    queues: dict[str, asyncio.Queue] = {}
+    consumers = []
+    for channel, handler in _QUEUED_HANDLERS.items():
+        queues[channel] = asyncio.Queue()
+        consumers.append(
+            asyncio.create_task(_consume_channel(channel, handler, queues[channel]))
+        )
 
     try:
         async for raw in pubsub.listen():
             if raw["type"] != "message":
                 continue
+            channel = raw["channel"].decode()
             try:
                 data = json.loads(raw["data"])
+                if channel in queues:
+                    queues[channel].put_nowait(data)
+                else:
+                    await _INLINE_HANDLERS[channel](data)
+            except Exception:
+                logger.exception("Failed to process %s message", channel)
+    except asyncio.CancelledError:
+        pass
+    finally:
+        for consumer in consumers:
+            consumer.cancel()
+        await pubsub.unsubscribe(*channels)
+        await pubsub.aclose()
 
-                member_id = data.get("member_id")
-                project_id = data.get("project_id")
-
-                record = LLMUsage(
-                    model=data["model"],
-                    provider=data["provider"],
-                    input_tokens=data.get("input_tokens"),
-                    output_tokens=data.get("output_tokens"),
-                    cost=data["cost"],
-                    request_type=data["request_type"],
-                    caller=data["caller"],
-                    session_id=data.get("session_id"),
-                    num_turns=data.get("num_turns"),
-                    duration_ms=data.get("duration_ms"),
-                    member_id=uuid.UUID(member_id) if member_id else None,
-                    project_id=uuid.UUID(project_id) if project_id else None,
-                )
-                async with async_session() as session:
-                    session.add(record)
+
+async def _purge_expired_sessions():
+    """Periodically delete expired auth sessions, off the request path."""
+    try:
+        while True:
+            try:
+                async with background_session() as session:
+                    result = await session.execute(
+                        delete(Session).where(Session.expires_at < func.now())
+                    )
                     await session.commit()
+                purged = result.rowcount  # type: ignore[reportAttributeAccessIssue]
+                if purged:
+                    logger.info("Purged %d expired session(s)", purged)
             except Exception:
-                logger.exception("Failed to process cost:usage message")
+                logger.exception("Failed to purge expired sessions")
+            await asyncio.sleep(SESSION_PURGE_INTERVAL_SECONDS)
+    except asyncio.CancelledError:
+        pass
+
+
+async def _maintain_llm_usage_partitions():
+    """Keep llm_usage partitions created through the month after next."""
+    try:
+        while True:
+            try:
+                # UTC months, matching the partition bounds
+                async with background_session() as session:
+                    skipped = await session.scalar(
+                        text(
+                            "SELECT llm_usage_ensure_partitions("
+                            "(now() AT TIME ZONE 'UTC')::date, "
+                            "((now() AT TIME ZONE 'UTC')::date "
+                            "+ interval '2 months')::date)"
+                        )
+                    )
+                    await session.commit()
+                if skipped:
+                    logger.error(
+                        "llm_usage partitions %s not created (lock timeout); "
+                        "retrying next run",
+                        ", ".join(skipped),
+                    )
+            except Exception:
+                logger.exception("Failed to create llm_usage partitions")
+            await asyncio.sleep(PARTITION_MAINTENANCE_INTERVAL_SECONDS)
     except asyncio.CancelledError:
         pass
-    finally:
-        await pubsub.unsubscribe("cost:usage")
-        await sub_client.aclose()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await _run_migrations()
-    ai_task = asyncio.create_task(_listen_for_ai_responses())
-    status_task = asyncio.create_task(_listen_for_chat_status())
-    cost_task = asyncio.create_task(_listen_for_cost_tracking())
+    pubsub_task = asyncio.create_task(_listen_for_redis_events())
+    purge_task = asyncio.create_task(_purge_expired_sessions())
+    partition_task = asyncio.create_task(_maintain_llm_usage_partitions())
     yield
-    ai_task.cancel()
-    status_task.cancel()
-    cost_task.cancel()
+    pubsub_task.cancel()
+    purge_task.cancel()
+    partition_task.cancel()
     await engine.dispose()
+    await background_engine.dispose()
     await redis_client.aclose()
+    await redis_pool.aclose()
+    await ai_client.aclose()
+    log_listener.stop()
 
 
-app = FastAPI(title="Team Agent API", lifespan=lifespan)
+app = FastAPI(
+    title="Team Agent API",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[settings.frontend_url],
+    allow_origins=settings.cors_allow_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+if settings.team_agent_env == "dev":
+    track_engine(engine)
+    app.add_middleware(QueryCountMiddleware)
+
 app.include_router(auth_router)
 app.include_router(projects_router)
 app.include_router(members_router)
@@ -275,3 +367,22 @@ async def health():
         "postgres": pg_status,
         "redis": redis_status,
     }
+
+
+def _pool_stats(pool) -> dict:
+    # overflow() starts at -pool_size and counts up as connections open
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+
+@app.get("/health/db")
+async def health_db():
+    """Connection pool occupancy for the request and background engines."""
+    return {
+        "api": _pool_stats(engine.pool),
+        "background": _pool_stats(background_engine.pool),
+    }
@@ -5,20 +5,26 @@ This module is the single source of truth for reading, writing, and validating
 that manifest. See ADR-0008 for the full ownership model.
 """
 
-import asyncio
-import json
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
 
+import orjson
+
+from .git import run_git
+
 logger = logging.getLogger(__name__)
 
 MANIFEST_DIR = ".team-agent"
 MANIFEST_PATH = f"{MANIFEST_DIR}/manifest.json"
 MANIFEST_VERSION = 1
 
+# (clone_path, project_id) -> (manifest st_mtime_ns, manifest) as last
+# validated VALID, so unchanged manifests skip the re-read on no-pull checks.
+_valid_manifests: dict[tuple[str, str], tuple[int, dict]] = {}
+
 
 class ManifestStatus(str, Enum):
     VALID = "valid"
@@ -37,18 +43,8 @@ class ManifestCheckResult:
     reason: str | None = None
 
 
-async def _run_git(*args: str, cwd: str) -> tuple[int, str, str]:
-    """Run a git command and return (returncode, stdout, stderr)."""
-    proc = await asyncio.create_subprocess_exec(
-        "git",
-        *args,
-        cwd=cwd,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await proc.communicate()
-    assert proc.returncode is not None
-    return proc.returncode, stdout.decode().strip(), stderr.decode().strip()
+def _dump_manifest(manifest: dict) -> bytes:
+    return orjson.dumps(manifest, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
 
 
 def read_manifest(clone_path: str | Path) -> dict | None:
@@ -57,8 +53,8 @@ def read_manifest(clone_path: str | Path) -> dict | None:
     if not manifest_file.exists():
         return None
     try:
-        return json.loads(manifest_file.read_text())
-    except (json.JSONDecodeError, OSError) as e:
+        return orjson.loads(manifest_file.read_bytes())
+    except (orjson.JSONDecodeError, OSError) as e:
         logger.warning("Failed to read manifest at %s: %s", manifest_file, e)
         return None
 
@@ -79,7 +75,7 @@ def write_manifest(
     }
     manifest_dir = Path(clone_path) / MANIFEST_DIR
     manifest_dir.mkdir(parents=True, exist_ok=True)
-    (manifest_dir / "manifest.json").write_text(json.dumps(manifest, indent=2) + "\n")
+    (manifest_dir / "manifest.json").write_bytes(_dump_manifest(manifest))
     return manifest
 
 
@@ -90,7 +86,7 @@ def update_manifest_board(clone_path: str | Path, board: dict) -> dict | None:
         return None
     manifest["board"] = board
     manifest_file = Path(clone_path) / MANIFEST_PATH
-    manifest_file.write_text(json.dumps(manifest, indent=2) + "\n")
+    manifest_file.write_bytes(_dump_manifest(manifest))
     return manifest
 
 
@@ -98,11 +94,11 @@ async def git_commit_and_push(clone_path: str | Path, message: str) -> tuple[boo
     """Stage .team-agent/, commit, and push. Returns (success, error_message)."""
     cwd = str(clone_path)
 
-    rc, _, stderr = await _run_git("add", ".team-agent/", cwd=cwd)
+    rc, _, stderr = await run_git("add", ".team-agent/", cwd=cwd)
     if rc != 0:
         return False, f"git add failed: {stderr}"
 
-    rc, _, stderr = await _run_git(
+    rc, _, stderr = await run_git(
         "-c",
         "user.name=team-agent",
         "-c",
@@ -115,7 +111,7 @@ async def git_commit_and_push(clone_path: str | Path, message: str) -> tuple[boo
     if rc != 0 and "nothing to commit" not in stderr:
         return False, f"git commit failed: {stderr}"
 
-    rc, _, stderr = await _run_git("push", cwd=cwd)
+    rc, _, stderr = await run_git("push", cwd=cwd)
     if rc != 0:
         return False, f"git push failed: {stderr}"
 
@@ -170,10 +166,21 @@ async def validate_manifest(
     cwd = str(clone_path)
 
     if pull:
-        rc, _, stderr = await _run_git("pull", "--ff-only", cwd=cwd)
+        rc, _, stderr = await run_git("pull", "--ff-only", cwd=cwd)
         if rc != 0:
             logger.warning("git pull failed for %s: %s", cwd, stderr)
 
+    # Stat before reading: a write racing the read changes the mtime and
+    # forces the next check to re-validate.
+    key = (cwd, project_id)
+    try:
+        mtime_ns = (Path(clone_path) / MANIFEST_PATH).stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    cached = _valid_manifests.get(key)
+    if not pull and cached is not None and cached[0] == mtime_ns:
+        return ManifestCheckResult(status=ManifestStatus.VALID, manifest=cached[1])
+
     manifest = read_manifest(clone_path)
 
     if manifest is None:
@@ -183,6 +190,8 @@ async def validate_manifest(
         )
 
     if manifest.get("project_id") == project_id:
+        if mtime_ns is not None:
+            _valid_manifests[key] = (mtime_ns, manifest)
         return ManifestCheckResult(status=ManifestStatus.VALID, manifest=manifest)
 
     # Ownership mismatch
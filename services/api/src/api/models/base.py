@@ -1,3 +1,5 @@
+import os
+import time
 import uuid
 from datetime import datetime, timezone
 
@@ -10,9 +12,22 @@ class Base(DeclarativeBase):
     pass
 
 
+def uuid7() -> uuid.UUID:
+    """Time-ordered UUID (RFC 9562 version 7).
+
+    A 48-bit Unix millisecond timestamp followed by random bits, so new keys
+    land at the right-hand edge of the primary key B-tree instead of at a
+    random page.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10))
+    value = value & ~(0xF << 76) | 0x7 << 76  # version
+    value = value & ~(0x3 << 62) | 0x2 << 62  # variant
+    return uuid.UUID(int=value)
+
+
 class UUIDPrimaryKey:
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
 
 
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -11,11 +11,14 @@ from .base import Base, UUIDPrimaryKey, TimestampMixin
 
 class Chat(UUIDPrimaryKey, TimestampMixin, Base):
     __tablename__ = "chats"
+    __table_args__ = (Index("ix_chats_room_id", "room_id"),)
 
     room_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("rooms.id"), nullable=False
     )
-    type: Mapped[str] = mapped_column(String, nullable=False)
+    type: Mapped[str] = mapped_column(
+        Enum("primary", "workload", "admin", name="chat_type"), nullable=False
+    )
     title: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     owner_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True), ForeignKey("project_members.id"), nullable=True
@@ -1,6 +1,15 @@
 import uuid
+from datetime import datetime, timezone
 
-from sqlalchemy import Float, ForeignKey, Index, Integer, String
+from sqlalchemy import (
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    PrimaryKeyConstraint,
+    String,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -10,8 +19,19 @@ from .base import Base, UUIDPrimaryKey, TimestampMixin
 class LLMUsage(UUIDPrimaryKey, TimestampMixin, Base):
     __tablename__ = "llm_usage"
     __table_args__ = (
+        PrimaryKeyConstraint("id", "created_at"),
         Index("ix_llm_usage_caller_created_at", "caller", "created_at"),
         Index("ix_llm_usage_member_created_at", "member_id", "created_at"),
+        # Monthly partitions, created ahead of time by the API's
+        # llm_usage_ensure_partitions() job.
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    # The partition key has to be part of the primary key.
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+        default=lambda: datetime.now(timezone.utc),
     )
 
     model: Mapped[str] = mapped_column(String, nullable=False)
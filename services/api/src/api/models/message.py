@@ -9,7 +9,9 @@ from .base import Base, UUIDPrimaryKey, TimestampMixin
 
 class Message(UUIDPrimaryKey, TimestampMixin, Base):
     __tablename__ = "messages"
-    __table_args__ = (Index("ix_messages_created_at", "created_at"),)
+    __table_args__ = (
+        Index("ix_messages_chat_id_created_at", "chat_id", "created_at"),
+    )
 
     chat_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("chats.id"), nullable=False
@@ -1,7 +1,7 @@
 import uuid
 from typing import Any
 
-from sqlalchemy import ForeignKey, String, Text, UniqueConstraint, text
+from sqlalchemy import Enum, ForeignKey, Index, String, Text, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -14,6 +14,7 @@ class ProjectMember(UUIDPrimaryKey, TimestampMixin, Base):
         UniqueConstraint(
             "project_id", "display_name", name="uq_project_members_project_display_name"
         ),
+        Index("ix_project_members_project_id_created_at", "project_id", "created_at"),
     )
 
     project_id: Mapped[uuid.UUID] = mapped_column(
@@ -23,7 +24,10 @@ class ProjectMember(UUIDPrimaryKey, TimestampMixin, Base):
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=True
     )
     display_name: Mapped[str] = mapped_column(String, nullable=False)
-    type: Mapped[str] = mapped_column(String, nullable=False)
+    type: Mapped[str] = mapped_column(
+        Enum("human", "ai", "coordinator", name="project_member_type"),
+        nullable=False,
+    )
     avatar: Mapped[str | None] = mapped_column(Text, nullable=True)
     settings: Mapped[dict[str, Any]] = mapped_column(
         JSONB, nullable=False, server_default=text("'{}'::jsonb")
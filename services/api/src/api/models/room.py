@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import Enum, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -9,11 +9,15 @@ from .base import Base, UUIDPrimaryKey, TimestampMixin
 
 class Room(UUIDPrimaryKey, TimestampMixin, Base):
     __tablename__ = "rooms"
+    __table_args__ = (Index("ix_rooms_project_id", "project_id"),)
 
     project_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("projects.id"), nullable=False
     )
     name: Mapped[str] = mapped_column(String, nullable=False)
     type: Mapped[str] = mapped_column(
-        String, nullable=False, default="standard", server_default="standard"
+        Enum("standard", "admin", name="room_type"),
+        nullable=False,
+        default="standard",
+        server_default="standard",
     )
@@ -1,4 +1,4 @@
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base, UUIDPrimaryKey, TimestampMixin
@@ -6,6 +6,9 @@ from .base import Base, UUIDPrimaryKey, TimestampMixin
 
 class User(UUIDPrimaryKey, TimestampMixin, Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_display_name", "display_name", postgresql_include=["id"]),
+    )
 
     display_name: Mapped[str] = mapped_column(String, nullable=False)
     email: Mapped[str | None] = mapped_column(String, unique=True, nullable=True)
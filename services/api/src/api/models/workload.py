@@ -1,7 +1,7 @@
 import uuid
 from typing import Optional
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -10,6 +10,10 @@ from .base import Base, UUIDPrimaryKey, TimestampMixin
 
 class Workload(UUIDPrimaryKey, TimestampMixin, Base):
     __tablename__ = "workloads"
+    __table_args__ = (
+        Index("ix_workloads_main_chat_id", "main_chat_id"),
+        Index("ix_workloads_member_id", "member_id"),
+    )
 
     main_chat_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("chats.id"), nullable=False
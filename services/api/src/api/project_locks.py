@@ -0,0 +1,41 @@
+"""In-process cache of project lock state for per-message lockdown checks."""
+
+import uuid
+
+from sqlalchemy import select
+
+from .database import async_session
+from .models.project import Project
+
+# project id → (is_locked, lock_reason). Lock state only changes in
+# check_manifest, in this process, which forgets the entry after committing,
+# so a cached answer is never stale.
+_lock_state: dict[uuid.UUID, tuple[bool, str | None]] = {}
+# Bumped by forget_lock so a read that raced a lock change isn't cached
+_generation = 0
+
+
+async def get_lock_state(project_id: uuid.UUID) -> tuple[bool, str | None]:
+    """Return (is_locked, lock_reason); unknown projects read as unlocked."""
+    if project_id in _lock_state:
+        return _lock_state[project_id]
+    generation = _generation
+    async with async_session() as session:
+        row = (
+            await session.execute(
+                select(Project.is_locked, Project.lock_reason).where(
+                    Project.id == project_id
+                )
+            )
+        ).one_or_none()
+    state = (row.is_locked, row.lock_reason) if row else (False, None)
+    if generation == _generation:
+        _lock_state[project_id] = state
+    return state
+
+
+def forget_lock(project_id: uuid.UUID) -> None:
+    """Drop the cached lock state after the project's lock changes."""
+    global _generation
+    _generation += 1
+    _lock_state.pop(project_id, None)
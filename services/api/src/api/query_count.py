@@ -0,0 +1,54 @@
+"""Per-request SQL statement counter for catching N+1 regressions in dev."""
+
+import logging
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# A one-element list so increments made inside SQLAlchemy's greenlet (which
+# shares the request task's context) are visible to the middleware.
+_statement_count: ContextVar[list[int] | None] = ContextVar(
+    "statement_count", default=None
+)
+
+
+def _count_statement(*_args) -> None:
+    counter = _statement_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def track_engine(engine: AsyncEngine) -> None:
+    """Count every statement the engine executes against the current request."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _count_statement)
+
+
+class QueryCountMiddleware:
+    """Warn when a single HTTP request issues more than ``threshold`` statements."""
+
+    def __init__(self, app: ASGIApp, threshold: int = 20):
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counter = [0]
+        token = _statement_count.set(counter)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _statement_count.reset(token)
+            if counter[0] > self.threshold:
+                logger.warning(
+                    "%s %s issued %d SQL statements (possible N+1)",
+                    scope["method"],
+                    scope["path"],
+                    counter[0],
+                )
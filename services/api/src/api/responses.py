@@ -0,0 +1,62 @@
+"""JSON response classes backed by orjson."""
+
+import hashlib
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """Drop-in JSONResponse that serialises with orjson instead of stdlib json.
+
+    Defined locally rather than using FastAPI's own (deprecated) class so the
+    app-wide default doesn't depend on the installed FastAPI version.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison (RFC 9110 §8.8.3.2): ignore W/ prefixes on both sides
+    opaque = etag.removeprefix("W/")
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def etag_response(request: Request, content: Any) -> Response:
+    """Serialise ``content`` with a weak ETag derived from the body.
+
+    Answers 304 with no body when the client's If-None-Match already holds
+    the tag, so polling an unchanged list costs headers only. Tagging the
+    body rather than max(created_at) keeps renames, lock changes and
+    deletes from being served as "not modified".
+    """
+    response = ORJSONResponse(content)
+    etag = weak_etag(response.body)
+    not_modified = not_modified_response(request, etag)
+    if not_modified is not None:
+        return not_modified
+    response.headers["ETag"] = etag
+    return response
+
+
+def weak_etag(data: bytes) -> str:
+    """A weak ETag over ``data``."""
+    return f'W/"{hashlib.blake2b(data, digest_size=16).hexdigest()}"'
+
+
+def not_modified_response(request: Request, etag: str) -> Response | None:
+    """A bodyless 304 if the client already holds ``etag``, else None.
+
+    Lets a route that can tag its result cheaply skip building it at all.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
@@ -36,7 +36,6 @@ async def get_admin_room(project_id: uuid.UUID):
             room = Room(project_id=project_id, name="Admin", type="admin")
             session.add(room)
             await session.commit()
-            await session.refresh(room)
 
         rows = (
             await session.execute(
@@ -113,7 +112,6 @@ async def create_admin_chat(
         )
         session.add(chat)
         await session.commit()
-        await session.refresh(chat)
 
         return {
             "id": str(chat.id),
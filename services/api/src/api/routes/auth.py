@@ -1,5 +1,7 @@
+import asyncio
 import logging
 import secrets
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
 
@@ -9,9 +11,17 @@ from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import JSONResponse, RedirectResponse
 from pydantic import BaseModel
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from ..config import settings
 from ..database import async_session
+from ..guards import (
+    cache_session,
+    evict_session,
+    get_session_user,
+    recache_user_sessions,
+)
+from ..list_cache import projects_cache, users_cache
 from ..models.project import Project
 from ..models.project_member import ProjectMember
 from ..models.session import Session
@@ -21,17 +31,28 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 logger = logging.getLogger(__name__)
 
 GOOGLE_DISCOVERY_URL = "https://accounts.google.com/.well-known/openid-configuration"
+GOOGLE_METADATA_TTL_SECONDS = 24 * 60 * 60
 _google_metadata: dict | None = None
+_google_metadata_expires_at = 0.0
+_google_metadata_lock = asyncio.Lock()
 
 
 async def _get_google_metadata() -> dict:
-    """Fetch and cache the Google OpenID Connect discovery document."""
-    global _google_metadata
-    if _google_metadata is None:
-        async with httpx.AsyncClient() as http:
-            resp = await http.get(GOOGLE_DISCOVERY_URL)
-            resp.raise_for_status()
-            _google_metadata = resp.json()
+    """Fetch and cache the Google OpenID Connect discovery document.
+
+    Refreshed daily; the lock makes concurrent cold-cache callers share
+    one fetch.
+    """
+    global _google_metadata, _google_metadata_expires_at
+    if _google_metadata is not None and time.monotonic() < _google_metadata_expires_at:
+        return _google_metadata
+    async with _google_metadata_lock:
+        if _google_metadata is None or time.monotonic() >= _google_metadata_expires_at:
+            async with httpx.AsyncClient() as http:
+                resp = await http.get(GOOGLE_DISCOVERY_URL)
+                resp.raise_for_status()
+                _google_metadata = resp.json()
+            _google_metadata_expires_at = time.monotonic() + GOOGLE_METADATA_TTL_SECONDS
     return _google_metadata  # type: ignore[reportReturnType]
 
 
@@ -47,18 +68,20 @@ def _set_session_cookie(response, session_id: str) -> None:
     )
 
 
-async def _create_session(user_id: uuid.UUID) -> str:
+async def _create_session(user: User) -> str:
     session_id = secrets.token_urlsafe(48)
     now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(days=settings.session_max_age_days)
     db_session_obj = Session(
         id=session_id,
-        user_id=user_id,
+        user_id=user.id,
         created_at=now,
-        expires_at=now + timedelta(days=settings.session_max_age_days),
+        expires_at=expires_at,
     )
     async with async_session() as db:
         db.add(db_session_obj)
         await db.commit()
+    await cache_session(session_id, user, expires_at)
     return session_id
 
 
@@ -134,26 +157,41 @@ async def callback(request: Request):
             db.add(user)
             await db.flush()
             logger.info("Created new user: %s (%s)", name, email)
-        else:
+        profile_changed = not is_new and user.avatar_url != avatar_url
+        if profile_changed:
             user.avatar_url = avatar_url
             await db.flush()
 
         # Auto-add new users to all existing projects
         if is_new:
-            projects = (await db.execute(select(Project))).scalars().all()
-            for project in projects:
-                member = ProjectMember(
-                    project_id=project.id,
-                    user_id=user.id,
-                    display_name=user.display_name,
-                    type="human",
+            project_ids = (await db.execute(select(Project.id))).scalars().all()
+            if project_ids:
+                # A same-named member already in a project (or a retried
+                # callback) is skipped rather than failing the login.
+                await db.execute(
+                    pg_insert(ProjectMember).on_conflict_do_nothing(
+                        index_elements=["project_id", "display_name"]
+                    ),
+                    [
+                        {
+                            "project_id": project_id,
+                            "user_id": user.id,
+                            "display_name": user.display_name,
+                            "type": "human",
+                        }
+                        for project_id in project_ids
+                    ],
                 )
-                db.add(member)
 
         await db.commit()
-        user_id = user.id
+    if is_new:
+        users_cache.clear()
+        projects_cache.clear()
+    elif profile_changed:
+        # The user's other live sessions still cache the old profile
+        await recache_user_sessions(user)
 
-    session_id = await _create_session(user_id)
+    session_id = await _create_session(user)
 
     response = RedirectResponse(url=settings.frontend_url, status_code=302)
     _set_session_cookie(response, session_id)
@@ -171,21 +209,16 @@ async def get_me(request: Request):
     if not session_id:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    async with async_session() as db:
-        session = await db.get(Session, session_id)
-        if not session or session.expires_at < datetime.now(timezone.utc):
-            raise HTTPException(status_code=401, detail="Invalid or expired session")
-
-        user = await db.get(User, session.user_id)
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
+    user = await get_session_user(session_id)
+    if user is None:
+        raise HTTPException(status_code=401, detail="Invalid or expired session")
 
-        return {
-            "id": str(user.id),
-            "display_name": user.display_name,
-            "email": user.email,
-            "avatar_url": user.avatar_url,
-        }
+    return {
+        "id": str(user.id),
+        "display_name": user.display_name,
+        "email": user.email,
+        "avatar_url": user.avatar_url,
+    }
 
 
 @router.post("/logout")
@@ -193,6 +226,7 @@ async def logout(request: Request):
     """Clear the session cookie and delete the session."""
     session_id = request.cookies.get("session_id")
     if session_id:
+        await evict_session(session_id)
         async with async_session() as db:
             session = await db.get(Session, session_id)
             if session:
@@ -231,7 +265,7 @@ if settings.team_agent_env == "dev":
             if not user:
                 raise HTTPException(status_code=404, detail="User not found")
 
-        session_id = await _create_session(user.id)
+        session_id = await _create_session(user)
 
         response = JSONResponse(
             {
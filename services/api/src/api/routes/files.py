@@ -1,14 +1,19 @@
 import asyncio
 import logging
 import mimetypes
+import os
 import uuid
+from functools import lru_cache
 from pathlib import Path
+from typing import BinaryIO
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 from fastapi.responses import Response
 from pydantic import BaseModel
+from sqlalchemy import select
 
 from ..database import async_session
+from ..git import run_git
 from ..guards import get_current_user, get_unlocked_project
 from ..models.chat import Chat
 from ..models.project import Project
@@ -21,12 +26,16 @@ router = APIRouter(dependencies=[Depends(get_current_user)])
 
 async def _get_clone_path(project_id: uuid.UUID) -> Path:
     async with async_session() as session:
-        project = await session.get(Project, project_id)
-        if not project or not project.clone_path:
-            raise HTTPException(
-                status_code=404, detail="Project not found or has no cloned repo"
+        clone_path = (
+            await session.execute(
+                select(Project.clone_path).where(Project.id == project_id)
             )
-    return Path(project.clone_path)
+        ).scalar_one_or_none()
+    if not clone_path:
+        raise HTTPException(
+            status_code=404, detail="Project not found or has no cloned repo"
+        )
+    return Path(clone_path)
 
 
 async def _resolve_repo_path(
@@ -58,13 +67,19 @@ async def _resolve_repo_path(
     return clone_path
 
 
+@lru_cache(maxsize=1024)
+def _resolved_root(clone_path: Path) -> Path:
+    """realpath() of a repo root; clone and worktree locations don't move."""
+    return clone_path.resolve()
+
+
 def _validate_path(clone_path: Path, relative_path: str) -> Path:
     """Resolve and validate that the path stays within the clone directory."""
     if ".." in relative_path.split("/"):
         raise HTTPException(status_code=400, detail="Invalid path")
 
     resolved = (clone_path / relative_path).resolve()
-    clone_resolved = clone_path.resolve()
+    clone_resolved = _resolved_root(clone_path)
 
     if not str(resolved).startswith(str(clone_resolved)):
         raise HTTPException(status_code=400, detail="Path traversal not allowed")
@@ -72,15 +87,8 @@ def _validate_path(clone_path: Path, relative_path: str) -> Path:
     return resolved
 
 
-def _is_gitignored(clone_path: Path, file_path: Path) -> bool:
-    """Check if a file is ignored by git using .gitignore patterns.
-
-    Simple heuristic: skip common ignored directories. A full implementation
-    would shell out to `git check-ignore` but this covers the main cases.
-    """
-    rel = file_path.relative_to(clone_path)
-    parts = rel.parts
-    ignored_dirs = {
+_IGNORED_DIRS = frozenset(
+    {
         "node_modules",
         ".git",
         "__pycache__",
@@ -97,10 +105,38 @@ def _is_gitignored(clone_path: Path, file_path: Path) -> bool:
         ".ruff_cache",
         ".pixi",
     }
-    for part in parts:
-        if part in ignored_dirs:
-            return True
-    return False
+)
+
+
+def _is_gitignored(rel_path: Path) -> bool:
+    """Check if a repo-relative path is ignored by git using .gitignore patterns.
+
+    Simple heuristic: skip common ignored directories. A full implementation
+    would shell out to `git check-ignore` but this covers the main cases.
+    """
+    return any(part in _IGNORED_DIRS for part in rel_path.parts)
+
+
+def _scan_dir(target: Path, prefix: str) -> list[dict]:
+    """List a directory, dirs first; runs in a worker thread."""
+    entries = []
+    # scandir's DirEntry reuses the type from readdir, so only regular
+    # files need a stat() (for their size).
+    with os.scandir(target) as it:
+        dir_entries = sorted(it, key=lambda e: (not e.is_dir(), e.name.lower()))
+    for entry in dir_entries:
+        if entry.name in _IGNORED_DIRS:
+            continue
+
+        entries.append(
+            {
+                "name": entry.name,
+                "type": "dir" if entry.is_dir() else "file",
+                "path": prefix + entry.name,
+                "size": entry.stat().st_size if entry.is_file() else None,
+            }
+        )
+    return entries
 
 
 @router.get("/projects/{project_id}/files")
@@ -111,30 +147,16 @@ async def list_files(project_id: uuid.UUID, path: str = ""):
     if not target.is_dir():
         raise HTTPException(status_code=400, detail="Path is not a directory")
 
-    entries = []
-    try:
-        for item in sorted(
-            target.iterdir(), key=lambda p: (not p.is_dir(), p.name.lower())
-        ):
-            if item.name.startswith(".") and item.name in {".git"}:
-                continue
-            if _is_gitignored(clone_path, item):
-                continue
+    rel_dir = target.relative_to(_resolved_root(clone_path))
+    if _is_gitignored(rel_dir):
+        return []
+    prefix = f"{rel_dir.as_posix()}/" if rel_dir.parts else ""
 
-            rel_path = str(item.relative_to(clone_path))
-            entries.append(
-                {
-                    "name": item.name,
-                    "type": "dir" if item.is_dir() else "file",
-                    "path": rel_path,
-                    "size": item.stat().st_size if item.is_file() else None,
-                }
-            )
+    try:
+        return await asyncio.to_thread(_scan_dir, target, prefix)
     except PermissionError:
         raise HTTPException(status_code=403, detail="Permission denied")
 
-    return entries
-
 
 @router.get("/projects/{project_id}/files/content")
 async def read_file(project_id: uuid.UUID, path: str, chat_id: uuid.UUID | None = None):
@@ -145,7 +167,7 @@ async def read_file(project_id: uuid.UUID, path: str, chat_id: uuid.UUID | None
         raise HTTPException(status_code=404, detail="File not found")
 
     try:
-        content = target.read_text(encoding="utf-8")
+        content = await asyncio.to_thread(target.read_text, encoding="utf-8")
     except UnicodeDecodeError:
         raise HTTPException(status_code=422, detail="File is not a text file")
     except PermissionError:
@@ -174,7 +196,7 @@ async def write_file(
         raise HTTPException(status_code=400, detail="Parent directory does not exist")
 
     try:
-        target.write_text(req.content, encoding="utf-8")
+        await asyncio.to_thread(target.write_text, req.content, encoding="utf-8")
     except PermissionError:
         raise HTTPException(status_code=403, detail="Permission denied")
 
@@ -201,10 +223,10 @@ async def create_file(
 
     try:
         if req.is_directory:
-            target.mkdir(parents=True, exist_ok=False)
+            await asyncio.to_thread(target.mkdir, parents=True, exist_ok=False)
         else:
-            target.parent.mkdir(parents=True, exist_ok=True)
-            target.touch()
+            await asyncio.to_thread(target.parent.mkdir, parents=True, exist_ok=True)
+            await asyncio.to_thread(target.touch)
     except PermissionError:
         raise HTTPException(status_code=403, detail="Permission denied")
 
@@ -226,9 +248,9 @@ async def delete_file(
 
     try:
         if target.is_dir():
-            target.rmdir()  # Only removes empty directories
+            await asyncio.to_thread(target.rmdir)  # Only removes empty directories
         else:
-            target.unlink()
+            await asyncio.to_thread(target.unlink)
     except OSError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -260,7 +282,7 @@ async def rename_file(
         raise HTTPException(status_code=409, detail="Target already exists")
 
     try:
-        source.rename(new_path)
+        await asyncio.to_thread(source.rename, new_path)
     except OSError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -279,7 +301,7 @@ async def serve_raw(
         raise HTTPException(status_code=404, detail="File not found")
 
     try:
-        content = target.read_bytes()
+        content = await asyncio.to_thread(target.read_bytes)
     except PermissionError:
         raise HTTPException(status_code=403, detail="Permission denied")
 
@@ -294,6 +316,24 @@ MAX_UPLOAD_SIZE = 100 * 1024 * 1024  # 100 MB per file
 CHUNK_SIZE = 8192
 
 
+def _save_upload(src: BinaryIO, dest: Path) -> int | None:
+    """Copy an upload to dest in a worker thread; returns its size.
+
+    Returns None (leaving nothing behind) if it exceeds MAX_UPLOAD_SIZE.
+    """
+    total_size = 0
+    with open(dest, "wb") as f:
+        while chunk := src.read(CHUNK_SIZE):
+            total_size += len(chunk)
+            if total_size > MAX_UPLOAD_SIZE:
+                break
+            f.write(chunk)
+    if total_size > MAX_UPLOAD_SIZE:
+        dest.unlink(missing_ok=True)
+        return None
+    return total_size
+
+
 @router.post("/projects/{project_id}/files/upload")
 async def upload_files(
     directory: str = Form("data/raw/"),
@@ -306,7 +346,7 @@ async def upload_files(
     clone_path = Path(project.clone_path)
 
     dest_dir = _validate_path(clone_path, directory)
-    dest_dir.mkdir(parents=True, exist_ok=True)
+    await asyncio.to_thread(dest_dir.mkdir, parents=True, exist_ok=True)
 
     uploaded = []
     errors = []
@@ -320,18 +360,10 @@ async def upload_files(
             continue
 
         file_path = _validate_path(clone_path, f"{directory}/{filename}")
-        total_size = 0
 
         try:
-            with open(file_path, "wb") as f:
-                while chunk := await file.read(CHUNK_SIZE):
-                    total_size += len(chunk)
-                    if total_size > MAX_UPLOAD_SIZE:
-                        break
-                    f.write(chunk)
-
-            if total_size > MAX_UPLOAD_SIZE:
-                file_path.unlink(missing_ok=True)
+            total_size = await asyncio.to_thread(_save_upload, file.file, file_path)
+            if total_size is None:
                 errors.append(
                     {"filename": filename, "detail": "File exceeds 100 MB limit"}
                 )
@@ -350,20 +382,6 @@ async def upload_files(
 # ── Git operations ──────────────────────────────────────────────────────────
 
 
-async def _run_git(*args: str, cwd: str) -> tuple[int, str, str]:
-    """Run a git command and return (returncode, stdout, stderr)."""
-    proc = await asyncio.create_subprocess_exec(
-        "git",
-        *args,
-        cwd=cwd,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await proc.communicate()
-    assert proc.returncode is not None
-    return proc.returncode, stdout.decode().strip(), stderr.decode().strip()
-
-
 class CommitRequest(BaseModel):
     paths: list[str]
     message: str
@@ -389,13 +407,13 @@ async def commit_and_push(
             raise HTTPException(status_code=404, detail=f"File not found: {p}")
 
     # Stage
-    rc, _, stderr = await _run_git("add", *req.paths, cwd=cwd)
+    rc, _, stderr = await run_git("add", *req.paths, cwd=cwd)
     if rc != 0:
         logger.error("git add failed: %s", stderr)
         raise HTTPException(status_code=500, detail="git add failed")
 
     # Commit
-    rc, _, stderr = await _run_git(
+    rc, _, stderr = await run_git(
         "-c",
         "user.name=team-agent",
         "-c",
@@ -410,7 +428,7 @@ async def commit_and_push(
         raise HTTPException(status_code=500, detail="git commit failed")
 
     # Push
-    rc, _, stderr = await _run_git("push", cwd=cwd)
+    rc, _, stderr = await run_git("push", cwd=cwd)
     if rc != 0:
         logger.error("git push failed: %s", stderr)
         raise HTTPException(status_code=500, detail="git push failed")
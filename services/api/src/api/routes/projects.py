@@ -5,14 +5,16 @@ import shutil
 import uuid
 from pathlib import Path
 
-import httpx
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import func, or_, select
 from sqlalchemy.exc import IntegrityError
 
+from ..ai_service import ai_service_request
 from ..config import settings
 from ..database import async_session
+from ..git import git_slots, run_git
+from ..list_cache import projects_cache
 from ..github import GitHubError, create_repo
 from ..board import GH_BIN, provision_board
 from ..manifest import (
@@ -24,17 +26,38 @@ from ..manifest import (
     validate_manifest,
     write_manifest,
 )
+from ..models.base import uuid7
 from ..models.project import Project
 from ..models.project_member import ProjectMember
 from ..models.room import Room
 from ..guards import get_current_user
 from ..models.user import User
+from ..project_locks import forget_lock
+from ..responses import etag_response
 
 router = APIRouter(dependencies=[Depends(get_current_user)])
 logger = logging.getLogger(__name__)
 
 CLONE_BASE = Path("/data/projects")
 PROJECT_TEMPLATE = Path(__file__).resolve().parents[3] / "project-template"
+CLONE_STDERR_TAIL_BYTES = 16 * 1024
+
+# Strong refs to fire-and-forget cleanup tasks so they aren't GC'd mid-run
+_cleanup_tasks: set[asyncio.Task] = set()
+
+
+def _discard_clone_dir(project_dir: Path) -> None:
+    """Delete an abandoned clone in the background.
+
+    The directory is keyed by the never-committed project id, so nothing
+    else will reuse the path; the caller can respond without waiting on
+    the unlink of a large working tree.
+    """
+    task = asyncio.create_task(
+        asyncio.to_thread(shutil.rmtree, project_dir, ignore_errors=True)
+    )
+    _cleanup_tasks.add(task)
+    task.add_done_callback(_cleanup_tasks.discard)
 
 
 class CreateProjectRequest(BaseModel):
@@ -47,46 +70,46 @@ class UpdateProjectRequest(BaseModel):
     default_branch: str
 
 
-@router.get("/projects")
-async def list_projects():
-    async with async_session() as session:
-        projects = (
-            (await session.execute(select(Project).order_by(Project.created_at)))
-            .scalars()
-            .all()
-        )
+# Correlated counts keep this to one query; joining both tables and
+# counting DISTINCT would multiply members x rooms per project first.
+_LIST_PROJECTS_STMT = select(
+    Project,
+    select(func.count())
+    .where(ProjectMember.project_id == Project.id)
+    .scalar_subquery()
+    .label("member_count"),
+    select(func.count())
+    .where(Room.project_id == Project.id)
+    .scalar_subquery()
+    .label("room_count"),
+).order_by(Project.created_at)
 
-        result = []
-        for p in projects:
-            member_count = len(
-                (
-                    await session.execute(
-                        select(ProjectMember).where(ProjectMember.project_id == p.id)
-                    )
-                )
-                .scalars()
-                .all()
-            )
-            room_count = len(
-                (await session.execute(select(Room).where(Room.project_id == p.id)))
-                .scalars()
-                .all()
-            )
-            result.append(
+
+@router.get("/projects")
+async def list_projects(request: Request):
+    projects = projects_cache.get()
+    if projects is None:
+        async with async_session() as session:
+            rows = await session.execute(_LIST_PROJECTS_STMT)
+            projects = [
                 {
-                    "id": str(p.id),
+                    "id": p.id,
                     "name": p.name,
                     "git_repo_url": p.git_repo_url,
                     "default_branch": p.default_branch,
-                    "member_count": member_count,
-                    "room_count": room_count,
+                    "member_count": members,
+                    "room_count": rooms,
                     "is_locked": p.is_locked,
                     "lock_reason": p.lock_reason,
-                    "created_at": p.created_at.isoformat(),
+                    "created_at": p.created_at,
                 }
-            )
+                for p, members, rooms in rows
+            ]
+        projects_cache.set(projects)
 
-        return result
+    # Returned as a Response so FastAPI skips jsonable_encoder; orjson
+    # writes the UUIDs and datetimes itself, in the same format.
+    return etag_response(request, projects)
 
 
 @router.get("/projects/{project_id}")
@@ -135,13 +158,14 @@ async def _init_and_push_repo(clone_path: str, clone_url: str) -> None:
         ["git", "push", "-u", "origin", "main"],
     ]
     for cmd in cmds:
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            cwd=clone_path,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        _, stderr = await proc.communicate()
+        async with git_slots:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                cwd=clone_path,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            _, stderr = await proc.communicate()
         if proc.returncode != 0:
             err_msg = stderr.decode().strip()
             # Sanitise: strip any token from URLs that git may echo
@@ -153,16 +177,7 @@ async def _init_and_push_repo(clone_path: str, clone_url: str) -> None:
             )
 
     # Reset remote URL to clean version (no token)
-    await asyncio.create_subprocess_exec(
-        "git",
-        "remote",
-        "set-url",
-        "origin",
-        clone_url,
-        cwd=clone_path,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
+    await run_git("remote", "set-url", "origin", clone_url, cwd=clone_path)
 
 
 @router.post("/projects")
@@ -170,12 +185,23 @@ async def create_project(
     req: CreateProjectRequest, creator: User = Depends(get_current_user)
 ):
     async with async_session() as session:
-        # Check name uniqueness
-        existing = (
-            await session.execute(select(Project).where(Project.name == req.name))
-        ).scalar_one_or_none()
-        if existing:
+        # Check name and repo URL uniqueness in one round trip, before any
+        # GitHub or clone work
+        taken = [Project.name == req.name]
+        if req.git_repo_url:
+            taken.append(Project.git_repo_url == req.git_repo_url)
+        clashes = (
+            (await session.execute(select(Project.name).where(or_(*taken))))
+            .scalars()
+            .all()
+        )
+        if req.name in clashes:
             raise HTTPException(status_code=409, detail="Project name already exists")
+        if clashes:
+            raise HTTPException(
+                status_code=409,
+                detail="A project with this git repository URL already exists.",
+            )
 
         creating_new = not req.git_repo_url
 
@@ -187,13 +213,15 @@ async def create_project(
             except GitHubError as e:
                 raise HTTPException(status_code=e.status_code, detail=e.detail)
 
-        # Create project
+        # Create project. Nothing is flushed until the final commit, so the
+        # row is inserted once with its clone path and branch already set.
         project = Project(
+            id=uuid7(),
             name=req.name,
             git_repo_url=git_repo_url,
+            default_branch=None,
         )
         session.add(project)
-        await session.flush()
 
         clone_path = str(CLONE_BASE / str(project.id) / "repo")
         Path(clone_path).parent.mkdir(parents=True, exist_ok=True)
@@ -215,7 +243,7 @@ async def create_project(
                 "uv",
                 "sync",
                 cwd=clone_path,
-                stdout=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.DEVNULL,
                 stderr=asyncio.subprocess.PIPE,
             )
             _, uv_stderr = await uv_proc.communicate()
@@ -261,23 +289,31 @@ async def create_project(
                     exc_info=True,
                 )
         else:
-            # Clone existing repo
-            clone_args = ["git", "clone"]
+            # Clone existing repo. Blobless: full commit/tree history (agents
+            # branch, merge and push from here) but file contents are only
+            # downloaded as they are checked out.
+            clone_args = ["git", "clone", "--filter=blob:none"]
             if req.default_branch:
                 clone_args += ["--branch", req.default_branch]
             clone_args += [git_repo_url, clone_path]
 
-            proc = await asyncio.create_subprocess_exec(
-                *clone_args,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            _, stderr = await proc.communicate()
-            if proc.returncode != 0:
-                raise HTTPException(
-                    status_code=422,
-                    detail=f"Git clone failed: {stderr.decode().strip()}",
+            async with git_slots:
+                proc = await asyncio.create_subprocess_exec(
+                    *clone_args,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE,
                 )
+                # Keep only the tail of stderr; the error is at the end, and a
+                # chatty clone (hooks, submodules) shouldn't buffer unbounded.
+                stderr = bytearray()
+                assert proc.stderr is not None
+                while chunk := await proc.stderr.read(65536):
+                    stderr += chunk
+                    del stderr[:-CLONE_STDERR_TAIL_BYTES]
+                await proc.wait()
+            if proc.returncode != 0:
+                err = stderr.decode(errors="replace").strip()
+                raise HTTPException(status_code=422, detail=f"Git clone failed: {err}")
 
             project.clone_path = clone_path
 
@@ -287,7 +323,7 @@ async def create_project(
                     "uv",
                     "sync",
                     cwd=clone_path,
-                    stdout=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.DEVNULL,
                     stderr=asyncio.subprocess.PIPE,
                 )
                 _, uv_stderr = await uv_proc.communicate()
@@ -297,18 +333,11 @@ async def create_project(
                     logger.info("Ran uv sync for project %s", req.name)
 
             # Read the actual checked-out branch and store it
-            branch_proc = await asyncio.create_subprocess_exec(
-                "git",
-                "symbolic-ref",
-                "--short",
-                "HEAD",
-                cwd=clone_path,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+            rc, branch_out, _ = await run_git(
+                "symbolic-ref", "--short", "HEAD", cwd=clone_path
             )
-            branch_out, _ = await branch_proc.communicate()
-            if branch_proc.returncode == 0:
-                project.default_branch = branch_out.decode().strip()
+            if rc == 0:
+                project.default_branch = branch_out
 
             logger.info(
                 "Cloned %s to %s (branch: %s)",
@@ -319,11 +348,11 @@ async def create_project(
 
             # Check if repo is already claimed by another project
             claim_check = check_unclaimed(clone_path)
-            if claim_check.status == ManifestStatus.CLAIMED_PROD:
-                shutil.rmtree(Path(clone_path).parent)
-                raise HTTPException(status_code=409, detail=claim_check.reason)
-            if claim_check.status == ManifestStatus.CLAIMED_OTHER:
-                shutil.rmtree(Path(clone_path).parent)
+            if claim_check.status in (
+                ManifestStatus.CLAIMED_PROD,
+                ManifestStatus.CLAIMED_OTHER,
+            ):
+                _discard_clone_dir(Path(clone_path).parent)
                 raise HTTPException(status_code=409, detail=claim_check.reason)
 
             # Create .team-agent/agents/ directory and write manifest
@@ -349,26 +378,27 @@ async def create_project(
         try:
             await session.commit()
         except IntegrityError:
+            _discard_clone_dir(Path(clone_path).parent)
             raise HTTPException(
                 status_code=409,
                 detail="A project with this git repository URL already exists.",
             )
-        await session.refresh(project)
-        await session.refresh(creator_member)
+    projects_cache.clear()
 
     # Generate Zimomo via AI service (outside the DB transaction)
     # This also triggers git commit+push of the manifest and Zimomo profile together
     zimomo_member = None
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            resp = await client.post(
-                f"{settings.ai_service_url}/generate-agent",
-                json={
-                    "project_name": req.name,
-                    "name": "Zimomo",
-                    "member_type": "coordinator",
-                },
-            )
+        resp = await ai_service_request(
+            "POST",
+            "/generate-agent",
+            timeout=60.0,
+            json={
+                "project_name": req.name,
+                "name": "Zimomo",
+                "member_type": "coordinator",
+            },
+        )
         if resp.status_code == 200:
             zimomo_member = resp.json()
             logger.info("Generated Zimomo for project %s", req.name)
@@ -400,66 +430,44 @@ async def update_project(project_id: uuid.UUID, req: UpdateProjectRequest):
 
         clone_path = project.clone_path
 
-        # Fetch latest refs from remote
-        fetch_proc = await asyncio.create_subprocess_exec(
-            "git",
-            "fetch",
+        # Validate branch exists on remote (ref names only, no objects)
+        rc, _, err = await run_git(
+            "ls-remote",
+            "--heads",
+            "--exit-code",
             "origin",
+            f"refs/heads/{req.default_branch}",
             cwd=clone_path,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
         )
-        await fetch_proc.communicate()
-
-        # Validate branch exists on remote
-        check_proc = await asyncio.create_subprocess_exec(
-            "git",
-            "branch",
-            "-r",
-            "--list",
-            f"origin/{req.default_branch}",
-            cwd=clone_path,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        check_out, _ = await check_proc.communicate()
-        if not check_out.decode().strip():
+        if rc == 2:
             raise HTTPException(
                 status_code=422,
                 detail=f"Branch '{req.default_branch}' does not exist on remote",
             )
+        if rc != 0:
+            raise HTTPException(
+                status_code=502, detail=f"Failed to query remote: {err}"
+            )
+
+        # Fetch just that branch so checkout can create it from origin
+        await run_git("fetch", "origin", req.default_branch, cwd=clone_path)
 
         # Checkout the branch
-        checkout_proc = await asyncio.create_subprocess_exec(
-            "git",
-            "checkout",
-            req.default_branch,
-            cwd=clone_path,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        rc, _, checkout_err = await run_git(
+            "checkout", req.default_branch, cwd=clone_path
         )
-        _, checkout_err = await checkout_proc.communicate()
-        if checkout_proc.returncode != 0:
+        if rc != 0:
             raise HTTPException(
                 status_code=422,
-                detail=f"Failed to switch branch: {checkout_err.decode().strip()}",
+                detail=f"Failed to switch branch: {checkout_err}",
             )
 
         # Pull latest changes for the branch
-        pull_proc = await asyncio.create_subprocess_exec(
-            "git",
-            "pull",
-            "origin",
-            req.default_branch,
-            cwd=clone_path,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        await pull_proc.communicate()
+        await run_git("pull", "origin", req.default_branch, cwd=clone_path)
 
         project.default_branch = req.default_branch
         await session.commit()
-        await session.refresh(project)
+        projects_cache.clear()
 
         logger.info(
             "Switched project %s to branch %s", project.name, req.default_branch
@@ -486,48 +494,18 @@ async def list_branches(project_id: uuid.UUID):
 
         clone_path = project.clone_path
 
-        # Fetch latest refs and prune stale tracking branches
-        fetch_proc = await asyncio.create_subprocess_exec(
-            "git",
-            "fetch",
-            "--prune",
-            "origin",
-            cwd=clone_path,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        await fetch_proc.communicate()
-
-        # List remote branches
-        proc = await asyncio.create_subprocess_exec(
-            "git",
-            "branch",
-            "-r",
-            "--format=%(refname:short)",
-            cwd=clone_path,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        # Ref names straight from the remote; nothing is downloaded
+        (_, heads_out, _), (head_rc, head_out, _) = await asyncio.gather(
+            run_git("ls-remote", "--heads", "--refs", "origin", cwd=clone_path),
+            run_git("symbolic-ref", "--short", "HEAD", cwd=clone_path),
         )
-        stdout, _ = await proc.communicate()
+        current = head_out if head_rc == 0 else None
 
         branches = []
-        for line in stdout.decode().strip().splitlines():
-            line = line.strip()
-            if line.startswith("origin/") and line != "origin/HEAD":
-                branches.append(line.removeprefix("origin/"))
-
-        # Current branch
-        head_proc = await asyncio.create_subprocess_exec(
-            "git",
-            "symbolic-ref",
-            "--short",
-            "HEAD",
-            cwd=clone_path,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        head_out, _ = await head_proc.communicate()
-        current = head_out.decode().strip() if head_proc.returncode == 0 else None
+        for line in heads_out.splitlines():
+            _, _, ref = line.partition("\t")
+            if ref.startswith("refs/heads/"):
+                branches.append(ref.removeprefix("refs/heads/"))
 
         return {
             "branches": sorted(branches),
@@ -559,11 +537,15 @@ async def check_manifest_endpoint(project_id: uuid.UUID, pull: bool = True):
             project.is_locked = True
             project.lock_reason = result.reason
             await session.commit()
+            projects_cache.clear()
+            forget_lock(project.id)
         elif result.status in (ManifestStatus.VALID, ManifestStatus.CORRECTED):
             if project.is_locked:
                 project.is_locked = False
                 project.lock_reason = None
                 await session.commit()
+                projects_cache.clear()
+                forget_lock(project.id)
 
         return {
             "status": result.status.value,
@@ -4,13 +4,16 @@ import uuid
 from datetime import date, datetime, timedelta
 from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel
-from sqlalchemy import func, select
+from sqlalchemy import and_, func, select, tuple_, update
+from sqlalchemy.orm import aliased
 
 from ..blocks import convert_text_blocks
 from ..database import async_session
 from ..guards import get_current_user, get_unlocked_project
+from ..list_cache import projects_cache
 from ..models.room import Room
 from ..models.chat import Chat
 from ..models.message import Message
@@ -18,6 +21,7 @@ from ..models.project import Project
 from ..models.project_member import ProjectMember
 from ..models.user import User
 from ..models.workload import Workload
+from ..responses import ORJSONResponse, etag_response
 from ..websocket.manager import manager
 
 router = APIRouter(dependencies=[Depends(get_current_user)])
@@ -33,38 +37,28 @@ class RenameRoomRequest(BaseModel):
 
 
 @router.get("/projects/{project_id}/rooms")
-async def list_rooms(project_id: uuid.UUID):
+async def list_rooms(project_id: uuid.UUID, request: Request):
     async with async_session() as session:
-        rooms = (
-            (
-                await session.execute(
-                    select(Room)
-                    .where(Room.project_id == project_id, Room.type == "standard")
-                    .order_by(Room.created_at)
-                )
-            )
-            .scalars()
-            .all()
+        # Filtered outer join so rooms without a primary chat still appear
+        rows = await session.execute(
+            select(Room.id, Room.name, Room.created_at, Chat.id.label("chat_id"))
+            .outerjoin(Chat, and_(Chat.room_id == Room.id, Chat.type == "primary"))
+            .where(Room.project_id == project_id, Room.type == "standard")
+            .order_by(Room.created_at)
         )
 
-        result = []
-        for room in rooms:
-            primary_chat = (
-                await session.execute(
-                    select(Chat).where(Chat.room_id == room.id, Chat.type == "primary")
-                )
-            ).scalar_one_or_none()
-
-            result.append(
+        return etag_response(
+            request,
+            [
                 {
-                    "id": str(room.id),
-                    "name": room.name,
-                    "primary_chat_id": str(primary_chat.id) if primary_chat else None,
-                    "created_at": room.created_at.isoformat(),
+                    "id": r.id,
+                    "name": r.name,
+                    "primary_chat_id": r.chat_id,
+                    "created_at": r.created_at,
                 }
-            )
-
-        return result
+                for r in rows
+            ],
+        )
 
 
 @router.post("/projects/{project_id}/rooms")
@@ -80,8 +74,7 @@ async def create_room(
         chat = Chat(room_id=room.id, type="primary")
         session.add(chat)
         await session.commit()
-        await session.refresh(room)
-        await session.refresh(chat)
+        projects_cache.clear()
 
         return {
             "id": str(room.id),
@@ -97,55 +90,86 @@ async def rename_room(
     req: RenameRoomRequest,
     project: Project = Depends(get_unlocked_project),
 ):
+    primary_chat_id = (
+        select(Chat.id)
+        .where(Chat.room_id == Room.id, Chat.type == "primary")
+        .scalar_subquery()
+    )
     async with async_session() as session:
-        room = (
+        # One round trip: rename and read back the row plus its primary chat
+        row = (
             await session.execute(
-                select(Room).where(Room.id == room_id, Room.project_id == project.id)
+                update(Room)
+                .where(Room.id == room_id, Room.project_id == project.id)
+                .values(name=req.name.strip())
+                .returning(
+                    Room.id,
+                    Room.name,
+                    Room.created_at,
+                    primary_chat_id.label("primary_chat_id"),
+                )
             )
-        ).scalar_one_or_none()
+        ).one_or_none()
 
-        if not room:
+        if not row:
             raise HTTPException(status_code=404, detail="Room not found")
 
-        room.name = req.name.strip()
         await session.commit()
-        await session.refresh(room)
-
-        primary_chat = (
-            await session.execute(
-                select(Chat).where(Chat.room_id == room.id, Chat.type == "primary")
-            )
-        ).scalar_one_or_none()
 
         return {
-            "id": str(room.id),
-            "name": room.name,
-            "primary_chat_id": str(primary_chat.id) if primary_chat else None,
-            "created_at": room.created_at.isoformat(),
+            "id": str(row.id),
+            "name": row.name,
+            "primary_chat_id": (
+                str(row.primary_chat_id) if row.primary_chat_id else None
+            ),
+            "created_at": row.created_at.isoformat(),
         }
 
 
 @router.get("/rooms/{room_id}/messages")
-async def get_room_messages(room_id: uuid.UUID):
+async def get_room_messages(
+    room_id: uuid.UUID,
+    limit: int | None = Query(
+        None, ge=1, le=1000, description="Return only the newest N messages"
+    ),
+    before: uuid.UUID | None = Query(
+        None, description="Keyset cursor: only messages older than this message"
+    ),
+):
     async with async_session() as session:
-        primary_chat = (
+        primary_chat_id = (
             await session.execute(
-                select(Chat).where(Chat.room_id == room_id, Chat.type == "primary")
+                select(Chat.id).where(Chat.room_id == room_id, Chat.type == "primary")
             )
         ).scalar_one_or_none()
 
-        if not primary_chat:
+        if not primary_chat_id:
             return []
 
-        return await _messages_for_chat(session, primary_chat.id)
+        return await _messages_for_chat(session, primary_chat_id, limit, before)
 
 
 @router.get("/rooms/{room_id}/workloads")
 async def list_workloads(room_id: uuid.UUID):
     async with async_session() as session:
+        # Only the columns the card needs; worktree_branch, main_chat_id and
+        # the chat's own title/owner never leave the database.
         rows = (
             await session.execute(
-                select(Chat, Workload, ProjectMember.display_name)
+                select(
+                    Chat.id,
+                    Chat.status,
+                    Chat.session_id.is_not(None).label("has_session"),
+                    Chat.created_at,
+                    Chat.updated_at,
+                    Workload.id.label("workload_id"),
+                    Workload.dispatch_id,
+                    Workload.title,
+                    Workload.description,
+                    Workload.permission_mode,
+                    Workload.member_id,
+                    ProjectMember.display_name,
+                )
                 .join(Workload, Chat.workload_id == Workload.id)
                 .outerjoin(ProjectMember, Workload.member_id == ProjectMember.id)
                 .where(Chat.room_id == room_id, Chat.type == "workload")
@@ -153,37 +177,45 @@ async def list_workloads(room_id: uuid.UUID):
             )
         ).all()
 
-        return [
-            {
-                "id": str(chat.id),
-                "workload_id": str(workload.id),
-                "dispatch_id": workload.dispatch_id,
-                "title": workload.title,
-                "description": workload.description,
-                "status": chat.status,
-                "permission_mode": workload.permission_mode,
-                "has_session": chat.session_id is not None,
-                "owner_name": display_name,
-                "owner_id": str(workload.member_id),
-                "created_at": chat.created_at.isoformat(),
-                "updated_at": chat.updated_at.isoformat()
-                if chat.updated_at
-                else chat.created_at.isoformat(),
-            }
-            for chat, workload, display_name in rows
-        ]
+        return ORJSONResponse(
+            [
+                {
+                    "id": row.id,
+                    "workload_id": row.workload_id,
+                    "dispatch_id": row.dispatch_id,
+                    "title": row.title,
+                    "description": row.description,
+                    "status": row.status,
+                    "permission_mode": row.permission_mode,
+                    "has_session": row.has_session,
+                    "owner_name": row.display_name,
+                    "owner_id": row.member_id,
+                    "created_at": row.created_at,
+                    "updated_at": row.updated_at or row.created_at,
+                }
+                for row in rows
+            ]
+        )
 
 
 @router.get("/chats/{chat_id}/messages")
-async def get_chat_messages(chat_id: uuid.UUID):
+async def get_chat_messages(
+    chat_id: uuid.UUID,
+    limit: int | None = Query(
+        None, ge=1, le=1000, description="Return only the newest N messages"
+    ),
+    before: uuid.UUID | None = Query(
+        None, description="Keyset cursor: only messages older than this message"
+    ),
+):
     async with async_session() as session:
-        return await _messages_for_chat(session, chat_id)
+        return await _messages_for_chat(session, chat_id, limit, before)
 
 
 def _extract_reply_to_id(content: str) -> str | None:
     try:
-        return json.loads(content).get("reply_to_id")
-    except (json.JSONDecodeError, TypeError):
+        return orjson.loads(content).get("reply_to_id")
+    except (orjson.JSONDecodeError, TypeError):
         return None
 
 
@@ -259,7 +291,6 @@ async def post_message(
         )
         session.add(message)
         await session.commit()
-        await session.refresh(message)
 
         # Capture values before session closes
         member_id_str = str(member.id)
@@ -294,29 +325,81 @@ async def post_message(
     return msg_data
 
 
-async def _messages_for_chat(session, chat_id: uuid.UUID):
-    rows = (
-        await session.execute(
-            select(Message, ProjectMember.display_name, ProjectMember.type)
-            .join(ProjectMember, Message.member_id == ProjectMember.id)
-            .where(Message.chat_id == chat_id)
-            .order_by(Message.created_at)
+async def _messages_for_chat(
+    session,
+    chat_id: uuid.UUID,
+    limit: int | None = None,
+    before: uuid.UUID | None = None,
+):
+    """A JSON response of a chat's messages, oldest first.
+
+    Without ``limit`` this is the whole history. With it, only the newest
+    ``limit`` messages older than ``before`` (a message id) are returned;
+    passing the first id of a page as the next ``before`` walks back through
+    history on the (chat_id, created_at) index without an OFFSET scan. A
+    ``before`` that isn't a message in this chat is a 404, not an empty page.
+    """
+    # Plain column rows, not Message entities: long chats skip ORM identity
+    # map bookkeeping for objects that are only ever serialised.
+    stmt = (
+        select(
+            Message.id,
+            Message.member_id,
+            Message.content,
+            Message.created_at,
+            ProjectMember.display_name,
+            ProjectMember.type,
         )
-    ).all()
-
-    return [
-        {
-            "id": str(msg.id),
-            "chat_id": str(msg.chat_id),
-            "member_id": str(msg.member_id),
-            "display_name": display_name,
-            "type": member_type,
-            "content": msg.content,
-            "created_at": msg.created_at.isoformat(),
-            "reply_to_id": _extract_reply_to_id(msg.content),
-        }
-        for msg, display_name, member_type in rows
-    ]
+        .join(ProjectMember, Message.member_id == ProjectMember.id)
+        .where(Message.chat_id == chat_id)
+    )
+    if before is not None:
+        anchor = aliased(Message)
+        # (created_at, id) so messages sharing a timestamp aren't skipped
+        stmt = stmt.where(
+            tuple_(Message.created_at, Message.id)
+            < select(anchor.created_at, anchor.id)
+            .where(anchor.id == before, anchor.chat_id == chat_id)
+            .scalar_subquery()
+        )
+    if limit is None:
+        stmt = stmt.order_by(Message.created_at, Message.id)
+        rows = (await session.execute(stmt)).all()
+    else:
+        stmt = stmt.order_by(Message.created_at.desc(), Message.id.desc())
+        rows = (await session.execute(stmt.limit(limit))).all()
+        rows.reverse()
+
+    # An unknown cursor makes the comparison NULL and the page empty; only
+    # then is it worth telling that apart from the start of history.
+    if before is not None and not rows:
+        anchor_exists = (
+            await session.execute(
+                select(Message.id).where(
+                    Message.id == before, Message.chat_id == chat_id
+                )
+            )
+        ).first()
+        if anchor_exists is None:
+            raise HTTPException(status_code=404, detail="Message not found")
+
+    # Raw UUIDs and datetimes: orjson renders them natively, the same as
+    # str()/isoformat(), without a per-field Python call for each message.
+    return ORJSONResponse(
+        [
+            {
+                "id": row.id,
+                "chat_id": chat_id,
+                "member_id": row.member_id,
+                "display_name": row.display_name,
+                "type": row.type,
+                "content": row.content,
+                "created_at": row.created_at,
+                "reply_to_id": _extract_reply_to_id(row.content),
+            }
+            for row in rows
+        ]
+    )
 
 
 @router.get("/projects/{project_id}/daily-activity")
@@ -1,16 +1,28 @@
+import asyncio
+import os
 import re
+from functools import lru_cache
 from pathlib import Path
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 
 from ..guards import get_current_user, get_unlocked_project
 from ..models.project import Project
+from ..responses import (
+    ORJSONResponse,
+    etag_response,
+    not_modified_response,
+    weak_etag,
+)
 
 router = APIRouter(dependencies=[Depends(get_current_user)])
 
 # Match YAML frontmatter between --- delimiters
 _FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---", re.DOTALL)
 _FIELD_RE = re.compile(r"^(\w+):\s*(.+)", re.MULTILINE)
+# Same match confined to one line, for a single finditer over the whole body
+_LINE_FIELD_RE = re.compile(r"^(\w+):[^\S\n]*(.+)", re.MULTILINE)
+_BLOCK_SCALARS = (">", "|", ">-", "|-")
 
 
 def _parse_frontmatter(text: str) -> dict[str, str]:
@@ -23,8 +35,19 @@ def _parse_frontmatter(text: str) -> dict[str, str]:
     if not match:
         return {}
     body = match.group(1)
+
+    # Common case: one "key: value" per line. A single regex pass is enough
+    # unless a key continues onto indented lines or uses a block scalar.
+    if "\n  " not in "\n" + body:
+        fields = {
+            m.group(1): m.group(2).strip().strip("\"'")
+            for m in _LINE_FIELD_RE.finditer(body)
+        }
+        if not any(v in _BLOCK_SCALARS for v in fields.values()):
+            return fields
+
     lines = body.split("\n")
-    fields: dict[str, str] = {}
+    fields = {}
     current_key: str | None = None
     current_parts: list[str] = []
 
@@ -37,7 +60,7 @@ def _parse_frontmatter(text: str) -> dict[str, str]:
             current_key = field_match.group(1)
             value = field_match.group(2).strip().strip("\"'")
             # If value is a YAML block scalar indicator, start collecting lines
-            if value in (">", "|", ">-", "|-"):
+            if value in _BLOCK_SCALARS:
                 current_parts = []
             else:
                 current_parts = [value]
@@ -55,18 +78,21 @@ def _parse_frontmatter(text: str) -> dict[str, str]:
 def _scan_skills(clone_path: Path) -> list[dict]:
     """Scan .claude/skills/ for valid SKILL.md files and return metadata."""
     skills_dir = clone_path / ".claude" / "skills"
-    if not skills_dir.is_dir():
+    try:
+        with os.scandir(skills_dir) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except (FileNotFoundError, NotADirectoryError):
         return []
 
     results = []
-    for skill_dir in sorted(skills_dir.iterdir()):
-        if not skill_dir.is_dir():
-            continue
-        skill_file = skill_dir / "SKILL.md"
-        if not skill_file.is_file():
+    for entry in entries:
+        # DirEntry answers from the directory read; no stat unless symlinked
+        if not entry.is_dir():
             continue
+        # A missing or non-file SKILL.md fails the open, so no is_file() stat
         try:
-            text = skill_file.read_text(encoding="utf-8")
+            with open(os.path.join(entry.path, "SKILL.md"), encoding="utf-8") as f:
+                text = f.read()
         except (OSError, UnicodeDecodeError):
             continue
 
@@ -76,7 +102,7 @@ def _scan_skills(clone_path: Path) -> list[dict]:
         if not name or not description:
             continue
 
-        rel_path = str(skill_dir.relative_to(clone_path))
+        rel_path = f".claude/skills/{entry.name}"
         results.append(
             {
                 "name": name,
@@ -88,9 +114,52 @@ def _scan_skills(clone_path: Path) -> list[dict]:
     return results
 
 
+def _skills_fingerprint(skills_dir: Path) -> tuple[tuple[str, int], ...] | None:
+    """(skill dir name, SKILL.md mtime) for every skill, or None if no dir.
+
+    One stat per skill; any added, removed or edited SKILL.md changes it.
+    """
+    try:
+        entries = list(os.scandir(skills_dir))
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    stamps = []
+    for entry in entries:
+        try:
+            mtime_ns = os.stat(os.path.join(entry.path, "SKILL.md")).st_mtime_ns
+        except OSError:
+            continue
+        stamps.append((entry.name, mtime_ns))
+    return tuple(sorted(stamps))
+
+
+@lru_cache(maxsize=256)
+def _scan_skills_cached(
+    clone_path: Path, fingerprint: tuple[tuple[str, int], ...]
+) -> list[dict]:
+    # fingerprint is only part of the cache key
+    return _scan_skills(clone_path)
+
+
 @router.get("/projects/{project_id}/skills")
-async def list_skills(project: Project = Depends(get_unlocked_project)):
-    clone_path = Path(project.clone_path) if project.clone_path else None
-    if not clone_path or not clone_path.is_dir():
+async def list_skills(
+    request: Request, project: Project = Depends(get_unlocked_project)
+):
+    if not project.clone_path:
         return []
-    return _scan_skills(clone_path)
+    clone_path = Path(project.clone_path)
+    # Filesystem work runs in worker threads: the fingerprint stats every
+    # SKILL.md, and a cache miss reads and parses them all.
+    fingerprint = await asyncio.to_thread(
+        _skills_fingerprint, clone_path / ".claude" / "skills"
+    )
+    if fingerprint is None:
+        return etag_response(request, [])
+    # The fingerprint already changes whenever the listing could, so tag it
+    # directly and answer a matching poll without reading any SKILL.md.
+    etag = weak_etag(repr((project.clone_path, fingerprint)).encode())
+    not_modified = not_modified_response(request, etag)
+    if not_modified is not None:
+        return not_modified
+    skills = await asyncio.to_thread(_scan_skills_cached, clone_path, fingerprint)
+    return ORJSONResponse(skills, headers={"ETag": etag})
@@ -3,11 +3,11 @@
 import logging
 import uuid
 
-import httpx
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
+from sqlalchemy import select
 
-from ..config import settings
+from ..ai_service import ai_service_request
 from ..database import async_session
 from ..guards import get_current_user
 from ..models.project import Project
@@ -26,18 +26,22 @@ async def create_terminal(req: CreateTerminalRequest):
     """Create a terminal session — resolve cwd and proxy to AI service."""
     if req.project_id:
         async with async_session() as session:
-            project = await session.get(Project, uuid.UUID(req.project_id))
-            if not project:
-                raise HTTPException(status_code=404, detail="Project not found")
-            cwd = project.clone_path
+            row = (
+                await session.execute(
+                    select(Project.clone_path).where(
+                        Project.id == uuid.UUID(req.project_id)
+                    )
+                )
+            ).one_or_none()
+        if not row:
+            raise HTTPException(status_code=404, detail="Project not found")
+        cwd = row.clone_path
     else:
         cwd = "/data/projects"
 
-    async with httpx.AsyncClient(timeout=30.0) as http:
-        resp = await http.post(
-            f"{settings.ai_service_url}/terminals",
-            json={"cwd": cwd},
-        )
+    resp = await ai_service_request(
+        "POST", "/terminals", timeout=30.0, json={"cwd": cwd}
+    )
 
     if resp.status_code >= 400:
         raise HTTPException(status_code=resp.status_code, detail=resp.text)
@@ -48,10 +52,9 @@ async def create_terminal(req: CreateTerminalRequest):
 @router.delete("/terminals/{session_id}")
 async def delete_terminal(session_id: str):
     """Destroy a terminal session — proxy to AI service."""
-    async with httpx.AsyncClient(timeout=10.0) as http:
-        resp = await http.delete(
-            f"{settings.ai_service_url}/terminals/{session_id}",
-        )
+    resp = await ai_service_request(
+        "DELETE", f"/terminals/{session_id}", timeout=10.0
+    )
 
     if resp.status_code == 404:
         raise HTTPException(status_code=404, detail="Terminal session not found")
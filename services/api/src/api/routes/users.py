@@ -1,26 +1,24 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy import select
 
 from ..database import async_session
 from ..guards import get_current_user
+from ..list_cache import users_cache
 from ..models.user import User
+from ..responses import etag_response
 
 router = APIRouter(dependencies=[Depends(get_current_user)])
 
 
 @router.get("/users")
-async def list_users():
+async def list_users(request: Request):
     """List all global users (for the landing page user picker)."""
-    async with async_session() as session:
-        users = (
-            (await session.execute(select(User).order_by(User.display_name)))
-            .scalars()
-            .all()
-        )
-        return [
-            {
-                "id": str(u.id),
-                "display_name": u.display_name,
-            }
-            for u in users
-        ]
+    users = users_cache.get()
+    if users is None:
+        async with async_session() as session:
+            rows = await session.execute(
+                select(User.id, User.display_name).order_by(User.display_name)
+            )
+            users = [{"id": u.id, "display_name": u.display_name} for u in rows]
+        users_cache.set(users)
+    return etag_response(request, users)
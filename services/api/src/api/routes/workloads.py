@@ -1,17 +1,18 @@
-import json
 import logging
 import uuid
 from datetime import date, datetime, timezone
 from typing import Literal
 
 import httpx
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import insert, select
 
-from ..config import settings
+from ..ai_service import ai_service_request
 from ..database import async_session
 from ..guards import get_current_user
+from ..models.base import uuid7
 from ..models.chat import Chat
 from ..models.project import Project
 from ..models.project_member import ProjectMember
@@ -53,7 +54,7 @@ class DispatchWorkloadItem(BaseModel):
 
 
 class DispatchRequest(BaseModel):
-    chat_id: str
+    chat_id: uuid.UUID
     dispatch_id: str
     workloads: list[DispatchWorkloadItem]
 
@@ -62,9 +63,16 @@ class SwitchModeRequest(BaseModel):
     permission_mode: Literal["default", "acceptEdits"]
 
 
+# System message that resumes a session after a permission-mode switch
+_MODE_RESUME_MESSAGES = {
+    mode: f"Session restarted with {label} mode. Continue where you left off."
+    for mode, label in (("default", "standard"), ("acceptEdits", "vibe coding"))
+}
+
+
 @router.post("/chats/{chat_id}/tool-approval", status_code=202)
 async def submit_tool_approval(
-    chat_id: str,
+    chat_id: uuid.UUID,
     req: ToolApprovalRequest,
     user: User = Depends(get_current_user),
 ):
@@ -75,7 +83,7 @@ async def submit_tool_approval(
     # Persist the approval event for standup/activity reporting
     async with async_session() as session:
         event = ToolApprovalEvent(
-            chat_id=uuid.UUID(chat_id),
+            chat_id=chat_id,
             user_id=user.id,
             tool_name=req.tool_name,
             decision=req.decision,
@@ -86,19 +94,19 @@ async def submit_tool_approval(
         await session.commit()
 
     payload = {
-        "chat_id": chat_id,
+        "chat_id": str(chat_id),
         "approval_request_id": req.approval_request_id,
         "decision": req.decision,
         "tool_name": req.tool_name,
         "reason": req.reason,
     }
 
-    await _get_redis().publish("tool:approvals", json.dumps(payload))
+    await _get_redis().publish("tool:approvals", orjson.dumps(payload))
     logger.info(
         "Published tool approval %s → %s (chat %s)",
         req.approval_request_id[:8],
         req.decision,
-        chat_id[:8],
+        str(chat_id)[:8],
     )
 
     return {"status": "accepted"}
@@ -106,7 +114,7 @@ async def submit_tool_approval(
 
 @router.get("/chats/{chat_id}/tool-approvals")
 async def get_tool_approvals(
-    chat_id: str,
+    chat_id: uuid.UUID,
     target_date: date = Query(None, alias="date"),
 ):
     """Return tool approval events for a chat on a given date."""
@@ -133,7 +141,7 @@ async def get_tool_approvals(
                 select(ToolApprovalEvent, User.display_name)
                 .join(User, ToolApprovalEvent.user_id == User.id)
                 .where(
-                    ToolApprovalEvent.chat_id == uuid.UUID(chat_id),
+                    ToolApprovalEvent.chat_id == chat_id,
                     ToolApprovalEvent.created_at >= day_start,
                     ToolApprovalEvent.created_at <= day_end,
                 )
@@ -157,10 +165,9 @@ async def get_tool_approvals(
 @router.post("/chats/{chat_id}/interrupt")
 async def interrupt_session(chat_id: str):
     """Interrupt a running session — proxy to AI service."""
-    async with httpx.AsyncClient(timeout=10.0) as http:
-        resp = await http.post(
-            f"{settings.ai_service_url}/chats/{chat_id}/interrupt",
-        )
+    resp = await ai_service_request(
+        "POST", f"/chats/{chat_id}/interrupt", timeout=10.0
+    )
     if resp.status_code == 404:
         raise HTTPException(status_code=404, detail="Session not found")
     if resp.status_code >= 400:
@@ -169,12 +176,11 @@ async def interrupt_session(chat_id: str):
 
 
 @router.post("/chats/{chat_id}/cancel")
-async def cancel_session(chat_id: str):
+async def cancel_session(chat_id: uuid.UUID):
     """Cancel a session — proxy to AI service, fall back to direct DB update."""
-    async with httpx.AsyncClient(timeout=10.0) as http:
-        resp = await http.post(
-            f"{settings.ai_service_url}/chats/{chat_id}/cancel",
-        )
+    resp = await ai_service_request(
+        "POST", f"/chats/{chat_id}/cancel", timeout=10.0
+    )
     if resp.status_code < 400:
         return resp.json()
 
@@ -188,7 +194,7 @@ async def cancel_session(chat_id: str):
     branch_name = None
 
     async with async_session() as session:
-        chat = await session.get(Chat, uuid.UUID(chat_id))
+        chat = await session.get(Chat, chat_id)
         if not chat:
             raise HTTPException(status_code=404, detail="Chat not found")
         if chat.status == "cancelled":
@@ -203,13 +209,20 @@ async def cancel_session(chat_id: str):
 
         # If investigating, gather context for notifying admin session
         if was_investigating and chat.workload_id:
-            room = await session.get(Room, chat.room_id)
-            if room:
-                project_id = str(room.project_id)
-            workload = await session.get(Workload, chat.workload_id)
-            if workload:
-                workload_title = workload.title
-                branch_name = workload.worktree_branch
+            context = (
+                await session.execute(
+                    select(
+                        Room.project_id, Workload.title, Workload.worktree_branch
+                    )
+                    .select_from(Room)
+                    .outerjoin(Workload, Workload.id == chat.workload_id)
+                    .where(Room.id == chat.room_id)
+                )
+            ).one_or_none()
+            if context:
+                project_id = str(context.project_id)
+                workload_title = context.title
+                branch_name = context.worktree_branch
 
         await session.commit()
 
@@ -218,9 +231,9 @@ async def cancel_session(chat_id: str):
     if room_id:
         await redis.publish(
             "chat:status",
-            json.dumps(
+            orjson.dumps(
                 {
-                    "chat_id": chat_id,
+                    "chat_id": str(chat_id),
                     "status": "cancelled",
                     "room_id": room_id,
                     "chat_type": chat_type,
@@ -234,47 +247,40 @@ async def cancel_session(chat_id: str):
         try:
             # Find the running admin chat for this project
             async with async_session() as session:
-                admin_room = (
+                admin_chat_id = (
                     await session.execute(
-                        select(Room).where(
+                        select(Chat.id)
+                        .join(Room, Chat.room_id == Room.id)
+                        .where(
                             Room.project_id == uuid.UUID(project_id),
                             Room.type == "admin",
+                            Chat.type == "admin",
+                            Chat.status == "running",
                         )
+                        .order_by(Chat.created_at.desc())
+                        .limit(1)
                     )
                 ).scalar_one_or_none()
 
-                if admin_room:
-                    admin_chat = (
-                        await session.execute(
-                            select(Chat)
-                            .where(
-                                Chat.room_id == admin_room.id,
-                                Chat.type == "admin",
-                                Chat.status == "running",
-                            )
-                            .order_by(Chat.created_at.desc())
-                        )
-                    ).scalar_first()  # type: ignore[reportAttributeAccessIssue]
-
-                    if admin_chat:
-                        title = workload_title or "Unknown workload"
-                        branch_info = (
-                            f" Remove worktree and delete branch `{branch_name}`."
-                            if branch_name
-                            else ""
-                        )
-                        await redis.publish(
-                            "chat:messages",
-                            json.dumps(
-                                {
-                                    "chat_id": str(admin_chat.id),
-                                    "content": (
-                                        f"Workload **{title}** was cancelled by the user. "
-                                        f"Please clean up — no further resolution needed.{branch_info}"
-                                    ),
-                                }
+            if admin_chat_id:
+                title = workload_title or "Unknown workload"
+                branch_info = (
+                    f" Remove worktree and delete branch `{branch_name}`."
+                    if branch_name
+                    else ""
+                )
+                await redis.publish(
+                    "chat:messages",
+                    orjson.dumps(
+                        {
+                            "chat_id": str(admin_chat_id),
+                            "content": (
+                                f"Workload **{title}** was cancelled by the user. "
+                                f"Please clean up — no further resolution needed.{branch_info}"
                             ),
-                        )
+                        }
+                    ),
+                )
         except Exception:
             logger.warning(
                 "Failed to notify admin session about cancelled investigation",
@@ -285,14 +291,14 @@ async def cancel_session(chat_id: str):
 
 
 @router.patch("/chats/{chat_id}")
-async def update_chat_status(chat_id: str, req: StatusUpdateRequest):
+async def update_chat_status(chat_id: uuid.UUID, req: StatusUpdateRequest):
     """Manually transition a chat status (needs_attention → completed)."""
     room_id = None
     updated_at = None
     chat_type = None
 
     async with async_session() as session:
-        chat = await session.get(Chat, uuid.UUID(chat_id))
+        chat = await session.get(Chat, chat_id)
 
         if not chat:
             raise HTTPException(status_code=404, detail="Chat not found")
@@ -313,9 +319,9 @@ async def update_chat_status(chat_id: str, req: StatusUpdateRequest):
     if room_id:
         await _get_redis().publish(
             "chat:status",
-            json.dumps(
+            orjson.dumps(
                 {
-                    "chat_id": chat_id,
+                    "chat_id": str(chat_id),
                     "status": req.status,
                     "room_id": room_id,
                     "chat_type": chat_type,
@@ -335,11 +341,9 @@ class ResolveRequest(BaseModel):
 @router.post("/chats/{chat_id}/resolve")
 async def resolve_workload(chat_id: str, req: ResolveRequest):
     """Resolve an escalated workload — proxy to AI service."""
-    async with httpx.AsyncClient(timeout=30.0) as http:
-        resp = await http.post(
-            f"{settings.ai_service_url}/chats/{chat_id}/resolve",
-            json=req.model_dump(),
-        )
+    resp = await ai_service_request(
+        "POST", f"/chats/{chat_id}/resolve", timeout=30.0, json=req.model_dump()
+    )
     if resp.status_code == 404:
         raise HTTPException(status_code=404, detail="Workload chat not found")
     if resp.status_code >= 400:
@@ -350,10 +354,9 @@ async def resolve_workload(chat_id: str, req: ResolveRequest):
 @router.post("/chats/{chat_id}/retry")
 async def retry_workload(chat_id: str):
     """Retry a failed workload session — proxy to AI service."""
-    async with httpx.AsyncClient(timeout=30.0) as http:
-        resp = await http.post(
-            f"{settings.ai_service_url}/chats/{chat_id}/retry",
-        )
+    resp = await ai_service_request(
+        "POST", f"/chats/{chat_id}/retry", timeout=30.0
+    )
     if resp.status_code == 404:
         raise HTTPException(status_code=404, detail="Workload chat not found")
     if resp.status_code >= 400:
@@ -361,6 +364,36 @@ async def retry_workload(chat_id: str):
     return resp.json()
 
 
+async def _start_workload_sessions(clone_path: str | None, workloads: list[dict]):
+    """Have the AI service start sessions for freshly dispatched workloads.
+
+    Asks directly over HTTP, which, unlike pub/sub, tells us the request
+    landed. Only when the AI service was definitely not reached (circuit
+    open, connection refused, error status) does it fall back to
+    dispatch:confirmed; a lost response may mean the sessions are already
+    starting, so it isn't retried through Redis and risk starting twice.
+    """
+    payload = {"clone_path": clone_path, "workloads": workloads}
+    try:
+        resp = await ai_service_request(
+            "POST", "/workloads/start", timeout=10.0, json=payload
+        )
+        if resp.status_code < 400:
+            return
+        logger.warning(
+            "AI service rejected workload start (%d); falling back to Redis",
+            resp.status_code,
+        )
+    except (HTTPException, httpx.ConnectError, httpx.ConnectTimeout):
+        logger.warning("AI service unreachable; falling back to Redis")
+    except httpx.TransportError:
+        # Sent but no clean answer: the sessions may already be starting
+        logger.warning("No response from AI service to workload start", exc_info=True)
+        return
+
+    await _get_redis().publish("dispatch:confirmed", orjson.dumps(payload))
+
+
 @router.post("/workloads/dispatch", status_code=201)
 async def dispatch_workloads(req: DispatchRequest):
     """Persist workloads from a dispatch card and trigger session startup."""
@@ -368,80 +401,93 @@ async def dispatch_workloads(req: DispatchRequest):
     results = []
 
     async with async_session() as session:
-        # Resolve room and project from the main chat
-        chat_result = await session.execute(
-            select(Chat).where(Chat.id == uuid.UUID(req.chat_id))
-        )
-        chat = chat_result.scalar_one_or_none()
-        if not chat:
+        # Resolve room and project from the main chat in one query
+        context = (
+            await session.execute(
+                select(Room.id.label("room_id"), Project.id, Project.clone_path)
+                .select_from(Chat)
+                .outerjoin(Room, Room.id == Chat.room_id)
+                .outerjoin(Project, Project.id == Room.project_id)
+                .where(Chat.id == req.chat_id)
+            )
+        ).one_or_none()
+        if not context:
             raise HTTPException(status_code=404, detail="Chat not found")
-
-        room_result = await session.execute(select(Room).where(Room.id == chat.room_id))
-        room = room_result.scalar_one_or_none()
-        if not room:
+        if context.room_id is None:
             raise HTTPException(status_code=404, detail="Room not found")
-
-        project_result = await session.execute(
-            select(Project).where(Project.id == room.project_id)
-        )
-        project = project_result.scalar_one_or_none()
-        if not project:
+        if context.id is None:
             raise HTTPException(status_code=404, detail="Project not found")
 
-        clone_path = project.clone_path
-
-        for w in req.workloads:
-            # Resolve member_id from agent display_name
-            member_result = await session.execute(
-                select(ProjectMember).where(
-                    ProjectMember.display_name == w.owner,
-                    ProjectMember.project_id == project.id,
-                    ProjectMember.type == "ai",
+        room_id = context.room_id
+        project_id = context.id
+        clone_path = context.clone_path
+
+        # Resolve every owner's member_id from agent display_name up front
+        owners = {w.owner for w in req.workloads}
+        owner_ids = dict(
+            (
+                await session.execute(
+                    select(ProjectMember.display_name, ProjectMember.id).where(
+                        ProjectMember.display_name.in_(owners),
+                        ProjectMember.project_id == project_id,
+                        ProjectMember.type == "ai",
+                    )
                 )
-            )
-            member = member_result.scalar_one_or_none()
-            if not member:
+            ).tuples()
+        )
+        for w in req.workloads:
+            if w.owner not in owner_ids:
                 raise HTTPException(
                     status_code=422,
                     detail=f"Agent '{w.owner}' not found",
                 )
 
-            workload_id = uuid.uuid4()
-            chat_id = uuid.uuid4()
-            now = datetime.now(timezone.utc)
-
-            workload = Workload(
-                id=workload_id,
-                main_chat_id=uuid.UUID(req.chat_id),
-                member_id=member.id,
-                title=w.title,
-                description=w.description,
-                dispatch_id=req.dispatch_id,
-                permission_mode=w.permission_mode,
+        # Keys are generated here, so each chat's workload_id is known without
+        # a flush and both tables go in as one multi-row INSERT each.
+        # One timestamp for the whole dispatch: rows, chats and broadcasts agree
+        now = datetime.now(timezone.utc)
+        workload_rows = []
+        chat_rows = []
+        for w in req.workloads:
+            member_id = owner_ids[w.owner]
+
+            workload_id = uuid7()
+            chat_id = uuid7()
+
+            workload_rows.append(
+                {
+                    "id": workload_id,
+                    "main_chat_id": req.chat_id,
+                    "member_id": member_id,
+                    "title": w.title,
+                    "description": w.description,
+                    "dispatch_id": req.dispatch_id,
+                    "permission_mode": w.permission_mode,
+                    "created_at": now,
+                }
             )
-            session.add(workload)
-            await session.flush()
-
-            workload_chat = Chat(
-                id=chat_id,
-                room_id=room.id,
-                type="workload",
-                title=w.title,
-                owner_id=member.id,
-                workload_id=workload_id,
-                status="assigned",
-                updated_at=now,
+            chat_rows.append(
+                {
+                    "id": chat_id,
+                    "room_id": room_id,
+                    "type": "workload",
+                    "title": w.title,
+                    "owner_id": member_id,
+                    "workload_id": workload_id,
+                    "status": "assigned",
+                    "created_at": now,
+                    "updated_at": now,
+                }
             )
-            session.add(workload_chat)
 
             results.append(
                 {
                     "id": str(workload_id),
-                    "project_id": str(project.id),
-                    "room_id": str(room.id),
-                    "main_chat_id": req.chat_id,
+                    "project_id": str(project_id),
+                    "room_id": str(room_id),
+                    "main_chat_id": str(req.chat_id),
                     "chat_id": str(chat_id),
-                    "member_id": str(member.id),
+                    "member_id": str(member_id),
                     "display_name": w.owner,
                     "title": w.title,
                     "description": w.description,
@@ -454,49 +500,49 @@ async def dispatch_workloads(req: DispatchRequest):
                 }
             )
 
+        if workload_rows:
+            await session.execute(insert(Workload), workload_rows)
+            await session.execute(insert(Chat), chat_rows)
         await session.commit()
 
-    redis = _get_redis()
-
-    # Notify frontend so workload panel updates immediately
-    for r in results:
-        await redis.publish(
-            "chat:status",
-            json.dumps(
-                {
-                    "chat_id": r["chat_id"],
-                    "status": "assigned",
-                    "room_id": r["room_id"],
-                    "chat_type": "workload",
-                    "updated_at": datetime.now(timezone.utc).isoformat(),
-                }
-            ),
-        )
+    # One pipelined round trip for every status update
+    async with _get_redis().pipeline(transaction=False) as pipe:
+        # Notify frontend so workload panel updates immediately
+        for r in results:
+            pipe.publish(
+                "chat:status",
+                orjson.dumps(
+                    {
+                        "chat_id": r["chat_id"],
+                        "status": "assigned",
+                        "room_id": r["room_id"],
+                        "chat_type": "workload",
+                        "updated_at": now.isoformat(),
+                    }
+                ),
+            )
+        await pipe.execute()
 
-    # Publish to Redis so AI service starts sessions
-    await redis.publish(
-        "dispatch:confirmed",
-        json.dumps({"clone_path": clone_path, "workloads": results}),
-    )
+    await _start_workload_sessions(clone_path, results)
 
     logger.info(
         "Dispatched %d workload(s) for chat %s",
         len(results),
-        req.chat_id[:8],
+        str(req.chat_id)[:8],
     )
 
     return {"workloads": [{"id": r["id"], "title": r["title"]} for r in results]}
 
 
 @router.post("/chats/{chat_id}/switch-mode")
-async def switch_mode(chat_id: str, req: SwitchModeRequest):
+async def switch_mode(chat_id: uuid.UUID, req: SwitchModeRequest):
     """Switch a session's permission mode — interrupt, update DB, auto-resume."""
     room_id = None
     updated_at = None
     chat_type = None
 
     async with async_session() as session:
-        chat = await session.get(Chat, uuid.UUID(chat_id))
+        chat = await session.get(Chat, chat_id)
         if not chat:
             raise HTTPException(status_code=404, detail="Chat not found")
 
@@ -518,15 +564,14 @@ async def switch_mode(chat_id: str, req: SwitchModeRequest):
 
         # 1. Interrupt if running or awaiting approval
         if chat.status in ("running", "awaiting_approval"):
-            async with httpx.AsyncClient(timeout=10.0) as http:
-                resp = await http.post(
-                    f"{settings.ai_service_url}/chats/{chat_id}/interrupt",
+            resp = await ai_service_request(
+                "POST", f"/chats/{chat_id}/interrupt", timeout=10.0
+            )
+            if resp.status_code >= 400 and resp.status_code != 404:
+                raise HTTPException(
+                    status_code=resp.status_code,
+                    detail=resp.text,
                 )
-                if resp.status_code >= 400 and resp.status_code != 404:
-                    raise HTTPException(
-                        status_code=resp.status_code,
-                        detail=resp.text,
-                    )
 
         # 2. Update permission_mode
         if chat_type == "workload":
@@ -540,37 +585,39 @@ async def switch_mode(chat_id: str, req: SwitchModeRequest):
         room_id = str(chat.room_id)
         await session.commit()
 
-    # 4. Broadcast mode change
-    if room_id and updated_at:
-        await _get_redis().publish(
-            "chat:status",
-            json.dumps(
+    # Both publishes go out in one pipelined round trip; order is preserved
+    async with _get_redis().pipeline(transaction=False) as pipe:
+        # 4. Broadcast mode change
+        if room_id and updated_at:
+            pipe.publish(
+                "chat:status",
+                orjson.dumps(
+                    {
+                        "chat_id": str(chat_id),
+                        "status": "needs_attention",
+                        "permission_mode": req.permission_mode,
+                        "room_id": room_id,
+                        "chat_type": chat_type,
+                        "updated_at": updated_at.isoformat(),
+                    }
+                ),
+            )
+
+        # 5. Auto-resume with a system message
+        pipe.publish(
+            "chat:messages",
+            orjson.dumps(
                 {
-                    "chat_id": chat_id,
-                    "status": "needs_attention",
-                    "permission_mode": req.permission_mode,
-                    "room_id": room_id,
-                    "chat_type": chat_type,
-                    "updated_at": updated_at.isoformat(),
+                    "chat_id": str(chat_id),
+                    "content": _MODE_RESUME_MESSAGES[req.permission_mode],
                 }
             ),
         )
-
-    # 5. Auto-resume with a system message
-    mode_label = "vibe coding" if req.permission_mode == "acceptEdits" else "standard"
-    await _get_redis().publish(
-        "chat:messages",
-        json.dumps(
-            {
-                "chat_id": chat_id,
-                "content": f"Session restarted with {mode_label} mode. Continue where you left off.",
-            }
-        ),
-    )
+        await pipe.execute()
 
     logger.info(
         "Switched chat %s to %s mode",
-        chat_id[:8],
+        str(chat_id)[:8],
         req.permission_mode,
     )
 
@@ -1,26 +1,36 @@
+import asyncio
 import json
 import logging
 import uuid
 
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 
 from datetime import datetime, timezone
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 
 from ..blocks import convert_text_blocks
 from ..database import async_session
+from ..guards import get_session_user
+from ..models.base import uuid7
 from ..models.chat import Chat
 from ..models.message import Message
-from ..models.project import Project
 from ..models.project_member import ProjectMember
 from ..models.room import Room
-from ..models.session import Session
+from ..project_locks import get_lock_state
 from .manager import manager
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Cap on AI notifications running detached from their socket's receive loop;
+# past it, the handler awaits the notification inline (backpressure).
+MAX_PENDING_NOTIFICATIONS = 64
+
+# Strong refs to fire-and-forget notification tasks so they aren't GC'd
+_notify_tasks: set[asyncio.Task] = set()
+
 
 def _get_redis():
     from ..main import redis_client
@@ -52,12 +62,12 @@ async def _enrich_with_reply_context(plain_text: str, reply_to_id: str | None) -
 
         # Extract text from the original message content
         try:
-            data = json.loads(msg.content)
+            data = orjson.loads(msg.content)
             if isinstance(data, dict) and "blocks" in data:
                 original_text = _extract_plain_text(data["blocks"])
             else:
                 original_text = msg.content
-        except (json.JSONDecodeError, TypeError):
+        except (orjson.JSONDecodeError, TypeError):
             original_text = msg.content
 
         # Truncate long originals
@@ -69,40 +79,79 @@ async def _enrich_with_reply_context(plain_text: str, reply_to_id: str | None) -
 
 async def _notify_ai_if_mentioned(mentions: list[str], chat_id: str):
     """Binary check: if any mentioned member is AI, publish one ai:respond event."""
-    async with async_session() as session:
-        for mid in mentions:
-            try:
-                member = await session.get(ProjectMember, uuid.UUID(mid))
-            except ValueError:
-                continue
+    member_ids = []
+    for mid in mentions:
+        try:
+            member_ids.append(uuid.UUID(mid))
+        except ValueError:
+            continue
+    if not member_ids:
+        return
 
-            if member and member.type in ("ai", "coordinator"):
-                # Look up the coordinator — always the actual responder
-                chat = await session.get(Chat, uuid.UUID(chat_id))
-                if chat:
-                    room = await session.get(Room, chat.room_id)
-                    if room:
-                        stmt = select(ProjectMember).where(
-                            ProjectMember.project_id == room.project_id,
-                            ProjectMember.type == "coordinator",
-                        )
-                        coordinator = (await session.execute(stmt)).scalar_one_or_none()
-                        if coordinator:
-                            # Typing indicator with coordinator identity
-                            await manager.broadcast(
-                                uuid.UUID(chat_id),
-                                {
-                                    "_event": "typing",
-                                    "member_id": str(coordinator.id),
-                                    "display_name": coordinator.display_name,
-                                },
-                            )
+    async with async_session() as session:
+        # One IN query answers "is anyone mentioned an AI?"
+        ai_mentioned = (
+            await session.execute(
+                select(ProjectMember.id)
+                .where(
+                    ProjectMember.id.in_(member_ids),
+                    ProjectMember.type.in_(("ai", "coordinator")),
+                )
+                .limit(1)
+            )
+        ).scalar_one_or_none()
+        if ai_mentioned is None:
+            return
 
-                await _get_redis().publish(
-                    "ai:respond", json.dumps({"chat_id": chat_id})
+        # Look up the coordinator — always the actual responder
+        coordinator = (
+            await session.execute(
+                select(ProjectMember.id, ProjectMember.display_name)
+                .join(Room, Room.project_id == ProjectMember.project_id)
+                .join(Chat, Chat.room_id == Room.id)
+                .where(
+                    Chat.id == uuid.UUID(chat_id),
+                    ProjectMember.type == "coordinator",
                 )
-                logger.info("Published ai:respond for chat %s", chat_id[:8])
-                return  # One publish per message, regardless of how many AI mentioned
+            )
+        ).one_or_none()
+
+    if coordinator:
+        # Typing indicator with coordinator identity
+        await manager.broadcast(
+            uuid.UUID(chat_id),
+            {
+                "_event": "typing",
+                "member_id": str(coordinator.id),
+                "display_name": coordinator.display_name,
+            },
+        )
+
+    # One publish per message, regardless of how many AI mentioned
+    await _get_redis().publish("ai:respond", orjson.dumps({"chat_id": chat_id}))
+    logger.info("Published ai:respond for chat %s", chat_id[:8])
+
+
+async def _notify_ai_logged(mentions: list[str], chat_id: str):
+    try:
+        await _notify_ai_if_mentioned(mentions, chat_id)
+    except Exception:
+        logger.warning("Failed to notify AI for chat %s", chat_id[:8], exc_info=True)
+
+
+async def _notify_ai_in_background(mentions: list[str], chat_id: str):
+    """Run the mention check off the receive loop.
+
+    Nothing is sent back on the socket and ai:respond carries only the chat
+    id, so ordering doesn't matter; the sender's next message needn't wait
+    on the member lookups and publish.
+    """
+    if len(_notify_tasks) >= MAX_PENDING_NOTIFICATIONS:
+        await _notify_ai_logged(mentions, chat_id)
+        return
+    task = asyncio.create_task(_notify_ai_logged(mentions, chat_id))
+    _notify_tasks.add(task)
+    task.add_done_callback(_notify_tasks.discard)
 
 
 @router.websocket("/ws/{chat_id}")
@@ -117,36 +166,46 @@ async def websocket_endpoint(
         await websocket.close(code=4001, reason="Not authenticated")
         return
 
-    async with async_session() as db:
-        auth_session = await db.get(Session, session_id)
-        if not auth_session or auth_session.expires_at < datetime.now(timezone.utc):
-            await websocket.close(code=4001, reason="Invalid or expired session")
-            return
+    # Same Redis-cached lookup as HTTP routes: a live session costs no query
+    user = await get_session_user(session_id)
+    if user is None:
+        await websocket.close(code=4001, reason="Invalid or expired session")
+        return
 
-        member = await db.get(ProjectMember, member_id)
-        if not member or member.user_id != auth_session.user_id:
+    async with async_session() as db:
+        # Member identity plus the chat's type, room and project in one query;
+        # these hold for the life of the connection.
+        info = (
+            await db.execute(
+                select(
+                    ProjectMember.user_id,
+                    ProjectMember.display_name,
+                    ProjectMember.type,
+                    Chat.type.label("chat_type"),
+                    Room.id.label("room_id"),
+                    Room.project_id,
+                )
+                .select_from(ProjectMember)
+                .outerjoin(Chat, Chat.id == chat_id)
+                .outerjoin(Room, Room.id == Chat.room_id)
+                .where(ProjectMember.id == member_id)
+            )
+        ).one_or_none()
+        if not info or info.user_id != user.id:
             await websocket.close(code=4003, reason="Forbidden")
             return
 
     await manager.connect(chat_id, websocket)
 
-    # Look up display name, type, and owning project
-    room_id = None
-    async with async_session() as session:
-        member = await session.get(ProjectMember, member_id)
-        display_name = member.display_name if member else "Unknown"
-        member_type = member.type if member else "human"
-
-        chat = await session.get(Chat, chat_id)
-        chat_type = chat.type if chat else "primary"
-
-        # Resolve project_id via chat → room for lockdown checks
-        project_id = None
-        if chat:
-            room = await session.get(Room, chat.room_id)
-            if room:
-                project_id = room.project_id
-                room_id = room.id
+    display_name = info.display_name
+    member_type = info.type
+    chat_type = info.chat_type or "primary"
+    # Resolved via chat → room for lockdown checks
+    project_id = info.project_id
+    room_id = info.room_id
+    # Stringified once; every event sent from this connection carries them
+    chat_id_str = str(chat_id)
+    member_id_str = str(member_id)
 
     # Register room-level connection for status broadcasts
     if room_id:
@@ -154,7 +213,7 @@ async def websocket_endpoint(
 
     try:
         while True:
-            data = await websocket.receive_json()
+            data = orjson.loads(await websocket.receive_text())
 
             # Typing indicator — ephemeral, no persistence
             if data.get("_event") == "typing":
@@ -162,7 +221,7 @@ async def websocket_endpoint(
                     chat_id,
                     {
                         "_event": "typing",
-                        "member_id": str(member_id),
+                        "member_id": member_id_str,
                         "display_name": display_name,
                     },
                     exclude=websocket,
@@ -171,16 +230,15 @@ async def websocket_endpoint(
 
             # Check project lockdown before processing each message
             if project_id:
-                async with async_session() as session:
-                    project = await session.get(Project, project_id)
-                    if project and project.is_locked:
-                        await websocket.send_json(
-                            {
-                                "error": "project_locked",
-                                "detail": f"Project is locked: {project.lock_reason}",
-                            }
-                        )
-                        continue
+                is_locked, lock_reason = await get_lock_state(project_id)
+                if is_locked:
+                    await websocket.send_json(
+                        {
+                            "error": "project_locked",
+                            "detail": f"Project is locked: {lock_reason}",
+                        }
+                    )
+                    continue
 
             # Expect structured format: {"blocks": [...], "mentions": [...], "reply_to_id": ...}
             blocks = data.get("blocks", [])
@@ -201,25 +259,31 @@ async def websocket_endpoint(
                 {"blocks": blocks, "mentions": mentions, "reply_to_id": reply_to_id}
             )
 
-            # Persist message
-            message = Message(
-                chat_id=chat_id,
-                member_id=member_id,
-                content=content,
-            )
+            # Persist message. Core INSERT with the key and timestamp made
+            # here: one statement, no unit-of-work flush and nothing to read
+            # back for the broadcast.
+            message_id = uuid7()
+            created_at = datetime.now(timezone.utc)
             async with async_session() as session:
-                session.add(message)
+                await session.execute(
+                    insert(Message).values(
+                        id=message_id,
+                        chat_id=chat_id,
+                        member_id=member_id,
+                        content=content,
+                        created_at=created_at,
+                    )
+                )
                 await session.commit()
-                await session.refresh(message)
 
             msg_data = {
-                "id": str(message.id),
-                "chat_id": str(chat_id),
-                "member_id": str(member_id),
+                "id": str(message_id),
+                "chat_id": chat_id_str,
+                "member_id": member_id_str,
                 "display_name": display_name,
                 "type": member_type,
-                "content": message.content,
-                "created_at": message.created_at.isoformat(),
+                "content": content,
+                "created_at": created_at.isoformat(),
                 "reply_to_id": reply_to_id,
             }
 
@@ -232,13 +296,13 @@ async def websocket_endpoint(
                 enriched = await _enrich_with_reply_context(plain_text, reply_to_id)
                 await _get_redis().publish(
                     "chat:messages",
-                    json.dumps({"chat_id": str(chat_id), "content": enriched}),
+                    orjson.dumps({"chat_id": chat_id_str, "content": enriched}),
                 )
                 logger.info(
-                    "Published %s message for chat %s", chat_type, str(chat_id)[:8]
+                    "Published %s message for chat %s", chat_type, chat_id_str[:8]
                 )
             elif mentions:
-                await _notify_ai_if_mentioned(mentions, str(chat_id))
+                await _notify_ai_in_background(mentions, chat_id_str)
 
     except WebSocketDisconnect:
         manager.disconnect(chat_id, websocket)
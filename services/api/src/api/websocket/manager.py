@@ -1,71 +1,113 @@
+import asyncio
 import logging
 import uuid
 
+import orjson
 from fastapi import WebSocket
 
 logger = logging.getLogger(__name__)
 
+# Window over which queued chat events are coalesced into one frame.
+BATCH_WINDOW_SECONDS = 0.005
+
 
 class ConnectionManager:
     def __init__(self):
-        self._connections: dict[uuid.UUID, list[WebSocket]] = {}
-        self._room_connections: dict[uuid.UUID, list[WebSocket]] = {}
+        self._connections: dict[uuid.UUID, set[WebSocket]] = {}
+        self._room_connections: dict[uuid.UUID, set[WebSocket]] = {}
+        self._pending: dict[uuid.UUID, list[dict]] = {}
+        self._flush_tasks: dict[uuid.UUID, asyncio.Task] = {}
 
     async def connect(self, chat_id: uuid.UUID, websocket: WebSocket):
         await websocket.accept()
-        if chat_id not in self._connections:
-            self._connections[chat_id] = []
-        self._connections[chat_id].append(websocket)
+        self._connections.setdefault(chat_id, set()).add(websocket)
 
     def disconnect(self, chat_id: uuid.UUID, websocket: WebSocket):
-        if chat_id in self._connections:
-            self._connections[chat_id].remove(websocket)
-            if not self._connections[chat_id]:
+        # A stale socket can be dropped by a broadcast and by its own handler
+        connections = self._connections.get(chat_id)
+        if connections is not None:
+            connections.discard(websocket)
+            if not connections:
                 del self._connections[chat_id]
 
-    async def _safe_send(self, ws: WebSocket, data: dict) -> bool:
-        try:
-            await ws.send_json(data)
-            return True
-        except RuntimeError:
-            return False
+    async def _send_all(
+        self, connections: set[WebSocket] | list[WebSocket], text: str
+    ) -> list[WebSocket]:
+        """Send one frame to every connection concurrently; return the stale ones.
+
+        Sends run side by side so one slow client doesn't hold up the rest.
+        Iterates a snapshot, since sockets can disconnect mid-send. Any send
+        failure (closed socket, disconnect, transport error) marks it stale.
+        """
+        targets = list(connections)
+        results = await asyncio.gather(
+            *(ws.send_text(text) for ws in targets), return_exceptions=True
+        )
+        return [
+            ws
+            for ws, result in zip(targets, results)
+            if isinstance(result, BaseException)
+        ]
+
+    def enqueue(self, chat_id: uuid.UUID, data: dict):
+        """Queue an event for chat_id; queued events go out as one JSON array.
+
+        The first event for a chat schedules a flush BATCH_WINDOW_SECONDS
+        later, so a burst of streamed events costs one frame per client.
+        """
+        self._pending.setdefault(chat_id, []).append(data)
+        if chat_id not in self._flush_tasks:
+            self._flush_tasks[chat_id] = asyncio.create_task(
+                self._flush(chat_id)
+            )
+
+    async def _flush(self, chat_id: uuid.UUID):
+        await asyncio.sleep(BATCH_WINDOW_SECONDS)
+        del self._flush_tasks[chat_id]
+        batch = self._pending.pop(chat_id, [])
+        if not batch or chat_id not in self._connections:
+            return
+        text = orjson.dumps(batch).decode()
+        for ws in await self._send_all(self._connections[chat_id], text):
+            self.disconnect(chat_id, ws)
 
     async def broadcast(self, chat_id: uuid.UUID, data: dict):
-        stale = []
-        for ws in self._connections.get(chat_id, []):
-            if not await self._safe_send(ws, data):
-                stale.append(ws)
-        for ws in stale:
+        connections = self._connections.get(chat_id)
+        if not connections:
+            return
+        # Encode once and send the same frame to every client, rather than
+        # send_json re-encoding with stdlib json per connection
+        text = orjson.dumps(data).decode()
+        for ws in await self._send_all(connections, text):
             self.disconnect(chat_id, ws)
 
     async def broadcast_except(
         self, chat_id: uuid.UUID, data: dict, exclude: WebSocket
     ):
-        stale = []
-        for ws in self._connections.get(chat_id, []):
-            if ws is not exclude:
-                if not await self._safe_send(ws, data):
-                    stale.append(ws)
-        for ws in stale:
+        connections = self._connections.get(chat_id)
+        if not connections:
+            return
+        text = orjson.dumps(data).decode()
+        others = [ws for ws in connections if ws is not exclude]
+        for ws in await self._send_all(others, text):
             self.disconnect(chat_id, ws)
 
     def connect_room(self, room_id: uuid.UUID, websocket: WebSocket):
-        if room_id not in self._room_connections:
-            self._room_connections[room_id] = []
-        self._room_connections[room_id].append(websocket)
+        self._room_connections.setdefault(room_id, set()).add(websocket)
 
     def disconnect_room(self, room_id: uuid.UUID, websocket: WebSocket):
-        if room_id in self._room_connections:
-            self._room_connections[room_id].remove(websocket)
-            if not self._room_connections[room_id]:
+        connections = self._room_connections.get(room_id)
+        if connections is not None:
+            connections.discard(websocket)
+            if not connections:
                 del self._room_connections[room_id]
 
     async def broadcast_room(self, room_id: uuid.UUID, data: dict):
-        stale = []
-        for ws in self._room_connections.get(room_id, []):
-            if not await self._safe_send(ws, data):
-                stale.append(ws)
-        for ws in stale:
+        connections = self._room_connections.get(room_id)
+        if not connections:
+            return
+        text = orjson.dumps(data).decode()
+        for ws in await self._send_all(connections, text):
             self.disconnect_room(room_id, ws)
 
 
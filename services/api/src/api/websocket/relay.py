@@ -0,0 +1,166 @@
+"""Shared Redis pub/sub fan-out for the one-way WebSocket relays."""
+
+import asyncio
+import contextlib
+import logging
+
+import orjson
+from redis.asyncio.client import PubSub
+
+logger = logging.getLogger(__name__)
+
+# Put on a channel's queues when its subscription dies, so relays stop
+# waiting instead of hanging on a reader that will never deliver again. A
+# private object, so no published message (not even JSON null) can match it.
+_LOST = object()
+
+# Pub/sub connections per hub; channels are spread across them by hash
+PUBSUB_SHARDS = 4
+
+
+def _offer(queue: asyncio.Queue, msg) -> None:
+    """Queue ``msg``, dropping the oldest entry if a bounded queue is full."""
+    try:
+        queue.put_nowait(msg)
+    except asyncio.QueueFull:
+        queue.get_nowait()
+        queue.put_nowait(msg)
+
+
+def _get_redis():
+    from ..main import redis_client
+
+    return redis_client
+
+
+class PubSubHub:
+    """Redis subscriptions fanned out to local relays over a few connections.
+
+    Channels are hashed onto ``shards`` pub/sub connections, each drained by
+    one reader task, so the connection count stays flat however many
+    screencasts or terminals are open. N viewers of the same channel share
+    one subscription and one decode per message; each gets its own queue.
+    A shard's connection is opened with its first channel and closed with
+    its last. With ``decode=False`` viewers get the raw payload bytes.
+    """
+
+    def __init__(self, decode: bool = True, shards: int = PUBSUB_SHARDS):
+        self._decode = decode
+        self._shard_count = shards
+        # channel → subscriber queues
+        self._queues: dict[str, set[asyncio.Queue]] = {}
+        # shard → (subscription, reader task, channels subscribed on it)
+        self._shards: dict[int, tuple[PubSub, asyncio.Task, set[str]]] = {}
+        self._lock = asyncio.Lock()
+
+    def _shard_of(self, channel: str) -> int:
+        return hash(channel) % self._shard_count
+
+    async def subscribe(self, channel: str, maxsize: int = 0) -> asyncio.Queue:
+        """Join ``channel``; a non-zero ``maxsize`` bounds the viewer's queue.
+
+        A bounded queue drops its oldest message when a slow viewer falls
+        behind, for streams where only recent messages matter (frames).
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize)
+        async with self._lock:
+            if channel in self._queues:
+                self._queues[channel].add(queue)
+                return queue
+            # Registered before subscribing, so a shard that fails meanwhile
+            # still hands this viewer the lost-subscription sentinel
+            self._queues[channel] = {queue}
+            shard = self._shard_of(channel)
+            entry = self._shards.get(shard)
+            try:
+                if entry is None:
+                    pubsub = _get_redis().pubsub(ignore_subscribe_messages=True)
+                    try:
+                        await pubsub.subscribe(channel)
+                    except Exception:
+                        await pubsub.aclose()
+                        raise
+                    channels = {channel}
+                    task = asyncio.create_task(self._read(shard, pubsub, channels))
+                    self._shards[shard] = (pubsub, task, channels)
+                else:
+                    entry[2].add(channel)
+                    await entry[0].subscribe(channel)
+            except Exception:
+                self._queues.pop(channel, None)
+                if entry is not None:
+                    entry[2].discard(channel)
+                raise
+        return queue
+
+    async def unsubscribe(self, channel: str, queue: asyncio.Queue) -> None:
+        async with self._lock:
+            queues = self._queues.get(channel)
+            if queues is None or queue not in queues:
+                return
+            queues.discard(queue)
+            if queues:
+                return
+            del self._queues[channel]
+            shard = self._shard_of(channel)
+            entry = self._shards.get(shard)
+            if entry is None:
+                return
+            pubsub, task, channels = entry
+            channels.discard(channel)
+            if channels:
+                await pubsub.unsubscribe(channel)
+                return
+            del self._shards[shard]
+        task.cancel()
+        try:
+            await pubsub.unsubscribe()
+        finally:
+            await pubsub.aclose()
+
+    async def _read(self, shard: int, pubsub: PubSub, channels: set[str]) -> None:
+        try:
+            # Subscribe confirmations are filtered by redis-py itself
+            async for raw in pubsub.listen():
+                queues = self._queues.get(raw["channel"].decode())
+                if not queues:
+                    continue
+                msg = orjson.loads(raw["data"]) if self._decode else raw["data"]
+                for queue in queues:
+                    _offer(queue, msg)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Redis subscription shard %d failed", shard)
+            entry = self._shards.get(shard)
+            if entry is not None and entry[2] is channels:
+                del self._shards[shard]
+            for channel in channels:
+                for queue in self._queues.pop(channel, ()):
+                    _offer(queue, _LOST)
+            with contextlib.suppress(Exception):
+                await pubsub.aclose()
+
+
+hub = PubSubHub()
+# Screencast channels carry binary JPEG frames alongside JSON control messages
+raw_hub = PubSubHub(decode=False)
+
+
+async def read_batch(queue: asyncio.Queue) -> list:
+    """Wait for the next message, then drain whatever else is already queued.
+
+    Idle streams pay no extra latency; a burst (terminal output, screencast
+    frames) comes back as one list so the relay can send it as one frame.
+    """
+    batch = [await queue.get()]
+    while not queue.empty():
+        batch.append(queue.get_nowait())
+    if any(msg is _LOST for msg in batch):
+        raise ConnectionError("Redis subscription lost")
+    return batch
+
+
+def encode_batch(batch: list[dict]) -> str:
+    """A lone message goes out as itself, a burst as one JSON array."""
+    return orjson.dumps(batch[0] if len(batch) == 1 else batch).decode()
@@ -1,20 +1,20 @@
 """WebSocket endpoint for screencast frame relay via Redis pub/sub."""
 
 import asyncio
-import json
 import logging
-from datetime import datetime, timezone
 
-import redis.asyncio as aioredis
+import orjson
 from fastapi import APIRouter, WebSocket
 
-from ..config import settings
-from ..database import async_session
-from ..models.session import Session
+from ..guards import get_session_user
+from .relay import raw_hub, read_batch
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Frames a slow viewer may fall behind by before the oldest are dropped
+FRAME_QUEUE_SIZE = 32
+
 
 @router.websocket("/ws/screencast/{chat_id}")
 async def screencast_websocket(websocket: WebSocket, chat_id: str):
@@ -26,35 +26,38 @@ async def screencast_websocket(websocket: WebSocket, chat_id: str):
         await websocket.close(code=4001, reason="Not authenticated")
         return
 
-    async with async_session() as db:
-        auth_session = await db.get(Session, auth_session_id)
-        if not auth_session or auth_session.expires_at < datetime.now(timezone.utc):
-            await websocket.close(code=4001, reason="Invalid or expired session")
-            return
+    # Redis-cached session lookup shared with the HTTP routes and chat socket
+    if await get_session_user(auth_session_id) is None:
+        await websocket.close(code=4001, reason="Invalid or expired session")
+        return
 
     await websocket.accept()
 
-    # Per-connection Redis subscriber for this chat's screencast frames
-    sub_client = aioredis.from_url(settings.redis_url)
-    pubsub = sub_client.pubsub()
+    # Shared subscription: every viewer of this chat reads from one channel
     channel = f"screencast:frames:{chat_id}"
-    await pubsub.subscribe(channel)
+    queue = await raw_hub.subscribe(channel, maxsize=FRAME_QUEUE_SIZE)
 
     try:
-        async for raw in pubsub.listen():
-            if raw["type"] != "message":
-                continue
-            msg = json.loads(raw["data"])
-            await websocket.send_json(msg)
+        while True:
+            # Frames are raw JPEG bytes, control messages JSON objects. Of the
+            # frames that queued up while the last send was in flight only the
+            # newest is worth showing; it goes out as one binary message.
+            batch = await read_batch(queue)
+            frames = [raw for raw in batch if raw[:1] != b"{"]
+            if frames:
+                await websocket.send_bytes(frames[-1])
+
+            controls = [raw for raw in batch if raw[:1] == b"{"]
+            for raw in controls:
+                await websocket.send_text(raw.decode())
 
             # If the screencast stopped, notify and break
-            if msg.get("type") == "stopped":
+            if any(orjson.loads(raw).get("type") == "stopped" for raw in controls):
                 break
     except asyncio.CancelledError:
         pass
     except Exception:
         logger.exception("Screencast relay error for chat %s", chat_id[:8])
     finally:
-        await pubsub.unsubscribe(channel)
-        await sub_client.aclose()
+        await raw_hub.unsubscribe(channel, queue)
         logger.info("Screencast WebSocket closed for chat %s", chat_id[:8])
@@ -1,16 +1,13 @@
 """WebSocket endpoint for terminal I/O relay via Redis pub/sub."""
 
 import asyncio
-import json
 import logging
-from datetime import datetime, timezone
 
-import redis.asyncio as aioredis
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from ..config import settings
-from ..database import async_session
-from ..models.session import Session
+from ..guards import get_session_user
+from .relay import encode_batch, hub, read_batch
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -22,6 +19,24 @@ def _get_redis():
     return redis_client
 
 
+class _RelayStopped(Exception):
+    """Raised by a finished terminal relay to tear down its task group."""
+
+
+def _tag_input(payload: bytes, session_id: str, suffix: bytes) -> bytes:
+    """Splice the session key into a client's JSON object without re-encoding.
+
+    The key goes last, so it overrides any session_id the client sent (JSON
+    decoders keep the last duplicate). Anything that isn't a non-empty
+    object takes the parse-and-dump path.
+    """
+    if payload[:1] == b"{" and payload[-1:] == b"}" and payload[1:-1].strip():
+        return payload[:-1] + suffix
+    data = orjson.loads(payload)
+    data["session_id"] = session_id
+    return orjson.dumps(data)
+
+
 @router.websocket("/ws/terminal/{session_id}")
 async def terminal_websocket(websocket: WebSocket, session_id: str):
     """Bidirectional relay between browser xterm.js and AI service PTY via Redis."""
@@ -32,69 +47,67 @@ async def terminal_websocket(websocket: WebSocket, session_id: str):
         await websocket.close(code=4001, reason="Not authenticated")
         return
 
-    async with async_session() as db:
-        auth_session = await db.get(Session, auth_session_id)
-        if not auth_session or auth_session.expires_at < datetime.now(timezone.utc):
-            await websocket.close(code=4001, reason="Invalid or expired session")
-            return
+    # Redis-cached session lookup shared with the HTTP routes and chat socket
+    if await get_session_user(auth_session_id) is None:
+        await websocket.close(code=4001, reason="Invalid or expired session")
+        return
 
     await websocket.accept()
 
-    # Per-connection Redis subscriber for this terminal session's output
-    sub_client = aioredis.from_url(settings.redis_url)
-    pubsub = sub_client.pubsub()
+    # Shared subscription to this terminal session's output
     output_channel = f"terminal:output:{session_id}"
-    await pubsub.subscribe(output_channel)
+    output_queue = await hub.subscribe(output_channel)
 
     async def relay_output():
         """Read from Redis terminal:output:{session_id} → send to WebSocket."""
         try:
-            async for raw in pubsub.listen():
-                if raw["type"] != "message":
-                    continue
-                msg = json.loads(raw["data"])
-                await websocket.send_json(msg)
+            while True:
+                # A burst of PTY output goes out as one WebSocket frame
+                batch = await read_batch(output_queue)
+                await websocket.send_text(encode_batch(batch))
 
                 # If the PTY closed, notify and stop
-                if msg.get("type") == "closed":
+                if any(msg.get("type") == "closed" for msg in batch):
                     break
-        except asyncio.CancelledError:
-            pass
         except Exception:
             logger.exception(
                 "Terminal output relay error for session %s", session_id[:8]
             )
+        raise _RelayStopped
 
     async def relay_input():
         """Read from WebSocket → publish to Redis terminal:input."""
         redis = _get_redis()
+        # Tail spliced onto every input object: ,"session_id":"..."}
+        suffix = b',"session_id":' + orjson.dumps(session_id) + b"}"
         try:
             while True:
-                data = await websocket.receive_json()
+                # Raw ASGI frames, forwarded without a Starlette-side decode
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                text = message.get("text")
+                payload = text.encode() if text is not None else message["bytes"]
                 # Attach session_id and forward to AI service
-                data["session_id"] = session_id
-                await redis.publish("terminal:input", json.dumps(data))
+                await redis.publish(
+                    "terminal:input", _tag_input(payload, session_id, suffix)
+                )
         except WebSocketDisconnect:
             pass
-        except asyncio.CancelledError:
-            pass
         except Exception:
             logger.exception(
                 "Terminal input relay error for session %s", session_id[:8]
             )
-
-    # Run both relays concurrently — when either stops, cancel the other
-    output_task = asyncio.create_task(relay_output())
-    input_task = asyncio.create_task(relay_input())
+        raise _RelayStopped
 
     try:
-        done, pending = await asyncio.wait(
-            [output_task, input_task],
-            return_when=asyncio.FIRST_COMPLETED,
-        )
-        for task in pending:
-            task.cancel()
+        # Run both relays concurrently — when either stops, the group
+        # cancels the other
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(relay_output())
+            tg.create_task(relay_input())
+    except* _RelayStopped:
+        pass
     finally:
-        await pubsub.unsubscribe(output_channel)
-        await sub_client.aclose()
+        await hub.unsubscribe(output_channel, output_queue)
         logger.info("Terminal WebSocket closed for session %s", session_id[:8])
@@ -0,0 +1,139 @@
+"""Tests for the AI service circuit breaker and request failure classification."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from src.api import ai_service
+from src.api.ai_service import CircuitBreaker
+
+CLOCK = "src.api.ai_service.time.monotonic"
+
+
+class Clock:
+    """Stand-in for time.monotonic that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = Clock()
+    with patch(CLOCK, clock):
+        yield clock
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(failure_threshold=3, reset_timeout=30.0)
+
+
+def _open(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+class TestCircuitBreaker:
+    def test_closed_allows_calls(self, breaker):
+        assert breaker.allow()
+
+    def test_stays_closed_below_threshold(self, breaker):
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.allow()
+
+    def test_opens_at_threshold(self, breaker):
+        _open(breaker)
+        assert not breaker.allow()
+
+    def test_success_resets_failure_count(self, breaker):
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.allow()
+
+    def test_rejects_until_reset_timeout(self, breaker, clock):
+        _open(breaker)
+        clock.now += 29.9
+        assert not breaker.allow()
+
+    def test_single_probe_after_reset_timeout(self, breaker, clock):
+        _open(breaker)
+        clock.now += 30.0
+        assert breaker.allow()
+        # Re-armed by the probe: concurrent callers keep failing fast
+        assert not breaker.allow()
+
+    def test_next_probe_waits_another_reset_timeout(self, breaker, clock):
+        _open(breaker)
+        clock.now += 30.0
+        assert breaker.allow()
+        clock.now += 29.9
+        assert not breaker.allow()
+        clock.now += 0.1
+        assert breaker.allow()
+
+    def test_failed_probe_reopens(self, breaker, clock):
+        _open(breaker)
+        clock.now += 30.0
+        assert breaker.allow()
+        breaker.record_failure()
+        clock.now += 29.9
+        assert not breaker.allow()
+
+    def test_successful_probe_closes(self, breaker, clock):
+        _open(breaker)
+        clock.now += 30.0
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.allow()
+        assert breaker.allow()
+        # Closing also clears the count, so it takes a full run to reopen
+        breaker.record_failure()
+        assert breaker.allow()
+
+
+@pytest.fixture
+def fresh_breaker(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0)
+    with patch.object(ai_service, "_breaker", breaker):
+        yield breaker
+
+
+def _request(**mock_kwargs):
+    """Patch the pooled client's request with an AsyncMock."""
+    return patch.object(ai_service.ai_client, "request", AsyncMock(**mock_kwargs))
+
+
+class TestAiServiceRequest:
+    def test_transport_error_counts_as_failure(self, fresh_breaker):
+        with _request(side_effect=httpx.ConnectError("refused")):
+            for _ in range(2):
+                with pytest.raises(httpx.ConnectError):
+                    asyncio.run(ai_service.ai_service_request("GET", "/", timeout=1))
+        assert not fresh_breaker.allow()
+
+    def test_error_status_counts_as_success(self, fresh_breaker):
+        fresh_breaker.record_failure()
+        with _request(return_value=httpx.Response(500)):
+            resp = asyncio.run(ai_service.ai_service_request("GET", "/", timeout=1))
+        assert resp.status_code == 500
+        # The earlier failure was cleared, so one more doesn't open it
+        fresh_breaker.record_failure()
+        assert fresh_breaker.allow()
+
+    def test_open_circuit_fails_fast_with_503(self, fresh_breaker):
+        _open(fresh_breaker)
+        with _request() as mock:
+            with pytest.raises(HTTPException) as exc:
+                asyncio.run(ai_service.ai_service_request("GET", "/", timeout=1))
+        assert exc.value.status_code == 503
+        mock.assert_not_called()
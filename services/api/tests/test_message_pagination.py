@@ -0,0 +1,133 @@
+"""Tests for keyset pagination of chat message history."""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import orjson
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import Session
+
+from src.api.models.message import Message
+from src.api.models.project_member import ProjectMember
+from src.api.routes.rooms import _messages_for_chat
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class _AsyncSession:
+    """Just enough of AsyncSession over a sync SQLite session for the query."""
+
+    def __init__(self, session: Session):
+        self._session = session
+
+    async def execute(self, stmt):
+        return self._session.execute(stmt)
+
+
+@pytest.fixture
+def session():
+    # Only the columns the history query touches; SQLite stands in for
+    # Postgres, and supports the same (created_at, id) row comparison.
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE messages (id CHAR(32) PRIMARY KEY, chat_id CHAR(32), "
+                "member_id CHAR(32), content TEXT, created_at DATETIME)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE TABLE project_members (id CHAR(32) PRIMARY KEY, "
+                "display_name TEXT, type TEXT, created_at DATETIME)"
+            )
+        )
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def member_id(session):
+    member_id = uuid.uuid4()
+    session.execute(
+        insert(ProjectMember.__table__).values(
+            id=member_id, display_name="Zimomo", type="human"
+        )
+    )
+    return member_id
+
+
+def _add_chat(session, member_id, created: list[datetime]) -> uuid.UUID:
+    chat_id = uuid.uuid4()
+    session.execute(
+        insert(Message),
+        [
+            {
+                "id": uuid.uuid4(),
+                "chat_id": chat_id,
+                "member_id": member_id,
+                "content": "{}",
+                "created_at": created_at,
+            }
+            for created_at in created
+        ],
+    )
+    session.commit()
+    return chat_id
+
+
+@pytest.fixture
+def chat_id(session, member_id):
+    """A chat whose middle messages share one created_at."""
+    created = [T0, T0 + timedelta(seconds=1)] + [T0 + timedelta(seconds=2)] * 5
+    created.append(T0 + timedelta(seconds=3))
+    return _add_chat(session, member_id, created)
+
+
+def _fetch(session, chat_id, limit=None, before=None) -> list[str]:
+    resp = asyncio.run(
+        _messages_for_chat(_AsyncSession(session), chat_id, limit, before)
+    )
+    return [msg["id"] for msg in orjson.loads(resp.body)]
+
+
+class TestMessagesForChat:
+    def test_limit_returns_newest_oldest_first(self, session, chat_id):
+        history = _fetch(session, chat_id)
+        assert _fetch(session, chat_id, limit=3) == history[-3:]
+
+    @pytest.mark.parametrize("page_size", [1, 2, 3, 4])
+    def test_pages_cover_history_exactly_once(self, session, chat_id, page_size):
+        # Page boundaries fall between messages sharing a created_at
+        history = _fetch(session, chat_id)
+        pages = []
+        before = None
+        while True:
+            page = _fetch(session, chat_id, limit=page_size, before=before)
+            if not page:
+                break
+            pages = page + pages
+            before = uuid.UUID(page[0])
+        assert pages == history
+        assert len(set(pages)) == len(history) == 8
+
+    def test_before_oldest_is_empty(self, session, chat_id):
+        oldest = uuid.UUID(_fetch(session, chat_id)[0])
+        assert _fetch(session, chat_id, limit=10, before=oldest) == []
+
+    def test_unknown_cursor_is_404(self, session, chat_id):
+        with pytest.raises(HTTPException) as exc:
+            _fetch(session, chat_id, limit=10, before=uuid.uuid4())
+        assert exc.value.status_code == 404
+
+    def test_cursor_from_another_chat_is_404(self, session, chat_id, member_id):
+        # Newer than everything in chat_id, so an unscoped anchor would
+        # return a full page of the wrong chat's history
+        other = _add_chat(session, member_id, [T0 + timedelta(days=1)])
+        foreign = uuid.UUID(_fetch(session, other)[0])
+        with pytest.raises(HTTPException) as exc:
+            _fetch(session, chat_id, limit=10, before=foreign)
+        assert exc.value.status_code == 404
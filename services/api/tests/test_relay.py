@@ -0,0 +1,49 @@
+"""Tests for batching and subscription-loss handling in the WebSocket relay."""
+
+import asyncio
+
+import orjson
+import pytest
+
+from src.api.websocket.relay import _LOST, _offer, encode_batch, read_batch
+
+
+def _read(*messages):
+    async def run():
+        queue: asyncio.Queue = asyncio.Queue()
+        for msg in messages:
+            queue.put_nowait(msg)
+        return await read_batch(queue)
+
+    return asyncio.run(run())
+
+
+class TestReadBatch:
+    def test_drains_queued_messages(self):
+        assert _read({"n": 1}, {"n": 2}) == [{"n": 1}, {"n": 2}]
+
+    def test_json_null_is_a_message(self):
+        assert _read(orjson.loads(b"null")) == [None]
+
+    def test_lost_subscription_raises(self):
+        with pytest.raises(ConnectionError):
+            _read({"n": 1}, _LOST)
+
+
+class TestOffer:
+    def test_full_queue_drops_oldest(self):
+        queue: asyncio.Queue = asyncio.Queue(2)
+        for n in range(4):
+            _offer(queue, n)
+        assert [queue.get_nowait(), queue.get_nowait()] == [2, 3]
+
+
+class TestEncodeBatch:
+    def test_single_message_is_sent_as_itself(self):
+        assert orjson.loads(encode_batch([{"n": 1}])) == {"n": 1}
+
+    def test_burst_is_sent_as_array(self):
+        assert orjson.loads(encode_batch([{"n": 1}, {"n": 2}])) == [
+            {"n": 1},
+            {"n": 2},
+        ]
@@ -0,0 +1,83 @@
+"""Tests for conditional-GET (ETag / If-None-Match) response helpers."""
+
+import pytest
+from starlette.requests import Request
+
+from src.api.responses import (
+    _etag_matches,
+    etag_response,
+    not_modified_response,
+    weak_etag,
+)
+
+ETAG = weak_etag(b"[1,2,3]")
+
+
+def _request(if_none_match: str | None = None) -> Request:
+    headers = []
+    if if_none_match is not None:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+class TestEtagMatches:
+    def test_exact_weak_tag(self):
+        assert _etag_matches(ETAG, ETAG)
+
+    def test_strong_form_matches_weak_tag(self):
+        assert _etag_matches(ETAG.removeprefix("W/"), ETAG)
+
+    def test_wildcard(self):
+        assert _etag_matches("*", ETAG)
+
+    def test_comma_separated_list(self):
+        assert _etag_matches(f'W/"other", {ETAG} , "third"', ETAG)
+
+    def test_no_match(self):
+        assert not _etag_matches('W/"other", "third"', ETAG)
+
+    def test_tag_is_not_a_substring_match(self):
+        assert not _etag_matches(ETAG[:-2] + '"', ETAG)
+
+
+class TestWeakEtag:
+    def test_stable_and_weak(self):
+        assert weak_etag(b"[1,2,3]") == ETAG
+        assert ETAG.startswith('W/"')
+
+    def test_differs_by_body(self):
+        assert weak_etag(b"[1,2]") != ETAG
+
+
+class TestNotModifiedResponse:
+    def test_none_without_header(self):
+        assert not_modified_response(_request(), ETAG) is None
+
+    def test_none_on_mismatch(self):
+        assert not_modified_response(_request('W/"other"'), ETAG) is None
+
+    def test_304_on_match(self):
+        resp = not_modified_response(_request(ETAG), ETAG)
+        assert resp.status_code == 304
+        assert resp.body == b""
+        assert resp.headers["etag"] == ETAG
+
+
+class TestEtagResponse:
+    def test_tags_full_response(self):
+        resp = etag_response(_request(), [1, 2, 3])
+        assert resp.status_code == 200
+        assert resp.body == b"[1,2,3]"
+        assert resp.headers["etag"] == ETAG
+
+    @pytest.mark.parametrize("header", [ETAG, "*", f'"x", {ETAG}'])
+    def test_304_when_client_holds_tag(self, header):
+        resp = etag_response(_request(header), [1, 2, 3])
+        assert resp.status_code == 304
+        assert resp.body == b""
+        assert resp.headers["etag"] == ETAG
+
+    def test_changed_content_is_sent_in_full(self):
+        resp = etag_response(_request(ETAG), [1, 2, 3, 4])
+        assert resp.status_code == 200
+        assert resp.headers["etag"] != ETAG
@@ -0,0 +1,42 @@
+"""Tests for the time-ordered primary key generator."""
+
+import time
+import uuid
+from unittest.mock import patch
+
+from src.api.models.base import uuid7
+
+CLOCK = "src.api.models.base.time.time_ns"
+
+
+class TestUuid7:
+    def test_version_is_7(self):
+        assert uuid7().version == 7
+
+    def test_variant_is_rfc_4122(self):
+        assert uuid7().variant == uuid.RFC_4122
+
+    def test_timestamp_is_current_unix_millis(self):
+        before = time.time_ns() // 1_000_000
+        value = uuid7()
+        after = time.time_ns() // 1_000_000
+        assert before <= value.int >> 80 <= after
+
+    def test_timestamp_taken_from_clock(self):
+        with patch(CLOCK, return_value=1_700_000_000_123_456_789):
+            value = uuid7()
+        assert value.int >> 80 == 1_700_000_000_123
+
+    def test_successive_milliseconds_sort_in_order(self):
+        start = 1_700_000_000_000
+        ids = []
+        for ms in range(start, start + 50):
+            with patch(CLOCK, return_value=ms * 1_000_000):
+                ids.append(uuid7())
+        assert ids == sorted(ids)
+        assert [str(i) for i in ids] == sorted(str(i) for i in ids)
+
+    def test_same_millisecond_ids_are_unique(self):
+        with patch(CLOCK, return_value=1_700_000_000_000_000_000):
+            ids = {uuid7() for _ in range(1000)}
+        assert len(ids) == 1000
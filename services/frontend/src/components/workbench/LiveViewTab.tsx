@@ -1,6 +1,6 @@
 "use client";
 
-import { useCallback, useRef, useState } from "react";
+import { useCallback, useEffect, useRef, useState } from "react";
 import type { IDockviewPanelProps } from "dockview";
 import { useScreencastWebSocket } from "@/hooks/useScreencastWebSocket";
 import styles from "./LiveViewTab.module.css";
@@ -13,11 +13,16 @@ type LiveViewTabParams = {
 export function LiveViewTab({ params }: IDockviewPanelProps<LiveViewTabParams>) {
   const { chatId, onClose } = params;
   const imgRef = useRef<HTMLImageElement>(null);
+  const frameUrlRef = useRef<string | null>(null);
   const [status, setStatus] = useState<"connecting" | "streaming" | "stopped">("connecting");
 
-  const onFrame = useCallback((data: string) => {
+  const onFrame = useCallback((jpeg: Blob) => {
     if (imgRef.current) {
-      imgRef.current.src = `data:image/jpeg;base64,${data}`;
+      // Release the previous frame's object URL once the next one replaces it
+      const url = URL.createObjectURL(jpeg);
+      imgRef.current.src = url;
+      if (frameUrlRef.current) URL.revokeObjectURL(frameUrlRef.current);
+      frameUrlRef.current = url;
     }
     setStatus((prev) => (prev === "streaming" ? prev : "streaming"));
   }, []);
@@ -31,6 +36,13 @@ export function LiveViewTab({ params }: IDockviewPanelProps<LiveViewTabParams>)
 
   useScreencastWebSocket({ chatId, onFrame, onStopped });
 
+  useEffect(
+    () => () => {
+      if (frameUrlRef.current) URL.revokeObjectURL(frameUrlRef.current);
+    },
+    [],
+  );
+
   return (
     <div className={styles.container}>
       <div className={styles.toolbar}>
@@ -7,7 +7,7 @@ const WS_URL = API_URL.replace(/^http/, "ws");
 
 type UseScreencastWebSocketOptions = {
   chatId: string | null;
-  onFrame: (data: string) => void;
+  onFrame: (jpeg: Blob) => void;
   onStopped: () => void;
 };
 
@@ -36,11 +36,13 @@ export function useScreencastWebSocket({
     };
 
     ws.onmessage = (event) => {
-      const msg = JSON.parse(event.data);
-
-      if (msg.type === "frame") {
-        onFrameRef.current(msg.data);
-      } else if (msg.type === "stopped") {
+      // Frames arrive as binary JPEG messages; control messages as JSON text
+      if (event.data instanceof Blob) {
+        onFrameRef.current(event.data);
+        return;
+      }
+      const msg: { type: string } = JSON.parse(event.data);
+      if (msg.type === "stopped") {
         receivedStopped = true;
         onStoppedRef.current();
       }
@@ -28,9 +28,7 @@ export function useTerminalWebSocket({
     const ws = new WebSocket(`${WS_URL}/ws/terminal/${sessionId}`);
     wsRef.current = ws;
 
-    ws.onmessage = (event) => {
-      const msg = JSON.parse(event.data);
-
+    const handleMessage = (msg: { type: string; data: string }) => {
       if (msg.type === "output") {
         const bytes = Uint8Array.from(atob(msg.data), (c) => c.charCodeAt(0));
         onDataRef.current(bytes);
@@ -39,6 +37,17 @@ export function useTerminalWebSocket({
       }
     };
 
+    ws.onmessage = (event) => {
+      const data = JSON.parse(event.data);
+
+      // Bursts of output arrive batched into arrays; a lone event is sent as-is
+      if (Array.isArray(data)) {
+        data.forEach(handleMessage);
+      } else {
+        handleMessage(data);
+      }
+    };
+
     ws.onclose = () => {
       // Terminal sessions are not auto-reconnected
     };
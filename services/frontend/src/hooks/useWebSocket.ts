@@ -40,18 +40,16 @@ export function useWebSocket(
 
     ws.onopen = () => setIsConnected(true);
 
-    ws.onmessage = (event) => {
-      const data = JSON.parse(event.data);
-
+    const handleEvent = (data: Record<string, unknown>) => {
       // Typing events — ephemeral, handled separately
       if (data._event === "typing") {
-        typingEventRef.current?.(data as TypingEvent);
+        typingEventRef.current?.(data as unknown as TypingEvent);
         return;
       }
 
       // Agent activity events — streaming status heartbeat
       if (data._event === "agent_activity") {
-        agentActivityRef.current?.(data as AgentActivityEvent);
+        agentActivityRef.current?.(data as unknown as AgentActivityEvent);
         return;
       }
 
@@ -61,13 +59,24 @@ export function useWebSocket(
         return;
       }
 
-      const msg: Message = data;
+      const msg = data as unknown as Message;
       setMessages((prev) => {
         if (prev.some((m) => m.id === msg.id)) return prev;
         return [...prev, msg];
       });
     };
 
+    ws.onmessage = (event) => {
+      const data = JSON.parse(event.data);
+
+      // AI responses arrive coalesced into arrays; everything else is a single event
+      if (Array.isArray(data)) {
+        data.forEach(handleEvent);
+      } else {
+        handleEvent(data);
+      }
+    };
+
     ws.onclose = () => {
       setIsConnected(false);
       reconnectTimer.current = setTimeout(connect, 2000);